@@ -0,0 +1,166 @@
+# Artifact rejection for EEG windows (blinks, electrode pops, muscle)
+#
+#   flags = artifact_flags(x, fs=256, window=256, step=128)
+#   flags["rejected"]        # (..., n_windows) bool, True = contaminated
+#   rejection_counts(flags)  # {"windows": ..., "rejected": ..., "amplitude": ...}
+#
+#   detector = StreamingArtifactDetector(fs=256, window=256)
+#   starts, flags = detector.push(new_samples)   # windows completed by this block
+#
+# A window is rejected when any of three checks fails:
+#   amplitude  peak-to-peak range above the threshold (blinks, movement)
+#   gradient   largest step between consecutive samples, per millisecond,
+#              above the threshold (electrode pops, spikes)
+#   hf_ratio   power between hf_low and hf_high Hz as a fraction of the
+#              broadband (ref_low to hf_high Hz) power, above the threshold
+#              (muscle / EMG)
+#
+# The checks run on the same strided window views as eeg_windows, so they are
+# a few reductions over all windows at once. Defaults assume signals in µV.
+# Clean EEG has a falling spectrum, so its 30-100 Hz share is well under 0.3.
+# Even white noise stays around 0.7, so only windows dominated by
+# high-frequency power cross the default 0.85. Strong mains hum (50/60 Hz)
+# falls in the high band, so notch-filter it first.
+import numpy as np
+
+from band_power import band_powers
+from eeg_windows import sliding_windows, window_starts
+
+DEFAULT_THRESHOLDS = {
+    "amplitude": 200.0,  # µV peak to peak
+    "gradient": 25.0,    # µV per ms
+    "hf_ratio": 0.85,    # share of broadband power
+    "hf_low": 30.0,      # Hz
+    "hf_high": 100.0,    # Hz, capped at Nyquist
+    "ref_low": 1.0,      # Hz, lower edge of the broadband reference
+}
+ARTIFACT_CHECKS = ["amplitude", "gradient", "hf_ratio"]
+
+
+def thresholds_with_defaults(thresholds=None):
+    unknown = set(thresholds or {}) - set(DEFAULT_THRESHOLDS)
+    if unknown:
+        raise ValueError(f"Unknown artifact thresholds: {', '.join(sorted(unknown))}")
+    return {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+
+
+def high_frequency_bands(fs, thresholds=None):
+    """{"hf": ..., "broadband": ...} bands for band_power.band_powers(); see high_frequency_ratio()."""
+    th = thresholds_with_defaults(thresholds)
+    # Bands are half-open, so a hf_high at or above Nyquist is moved past it to keep the last bin
+    high = th["hf_high"] if th["hf_high"] < fs / 2 else fs
+    return {"hf": (th["hf_low"], high), "broadband": (th["ref_low"], high)}
+
+
+def high_frequency_ratio(powers):
+    """hf_ratio from (..., 2) powers of the high_frequency_bands() (0 where there is no broadband power)."""
+    hf, broadband = powers[..., 0], powers[..., 1]
+    return np.divide(hf, broadband, out=np.zeros_like(hf), where=broadband != 0)
+
+
+def artifact_flags(x, fs, window, step=None, thresholds=None, hf_ratio=None):
+    """Per-check and combined rejection flags (..., n_windows) for every window of x.
+
+    hf_ratio may be passed in when the caller already has each window's
+    high_frequency_ratio() (window_features() does, from its own FFT).
+    """
+    th = thresholds_with_defaults(thresholds)
+    if window < 2:
+        raise ValueError("Artifact checks need windows of at least 2 samples")
+    x = np.asarray(x, dtype=np.float64)
+    w = sliding_windows(x, window, step)
+    # Steps between neighbours: one diff of the signal, windowed like x
+    steps = sliding_windows(np.abs(np.diff(x, axis=-1)), window - 1, step)
+    if hf_ratio is None:
+        hf_ratio = high_frequency_ratio(band_powers(w, fs, high_frequency_bands(fs, th)))
+    flags = {
+        "amplitude": np.ptp(w, axis=-1) > th["amplitude"],
+        "gradient": steps.max(axis=-1, initial=0.0) * fs / 1000 > th["gradient"],
+        "hf_ratio": hf_ratio > th["hf_ratio"],
+    }
+    flags["rejected"] = flags["amplitude"] | flags["gradient"] | flags["hf_ratio"]
+    return flags
+
+
+def rejection_counts(flags, channel_axis=None):
+    """Window and rejection counts per check.
+
+    channel_axis counts a window once when any channel along that axis is
+    flagged, as for multi-channel windows that are kept or dropped together.
+    """
+    counts = {}
+    for name in ["rejected"] + ARTIFACT_CHECKS:
+        flag = flags[name]
+        if channel_axis is not None:
+            flag = flag.any(axis=channel_axis)
+        counts[name] = int(flag.sum())
+        counts.setdefault("windows", int(flag.size))
+    return counts
+
+
+class StreamingArtifactDetector:
+    """artifact_flags() over a signal that arrives in blocks of any size.
+
+    Keeps at most window + step samples between calls, so flags match one call
+    on the whole signal and memory stays bounded. Running totals are kept in
+    `counts`.
+    """
+
+    def __init__(self, fs, window, step=None, thresholds=None):
+        self.fs = fs
+        self.window = window
+        self.step = window if step is None else step
+        self.thresholds = thresholds_with_defaults(thresholds)
+        self.reset()
+
+    def reset(self):
+        self._carry = None
+        self._next_start = 0  # global sample index of the next window
+        self._skip = 0  # samples to drop before that window (step > window)
+        self.counts = {name: 0 for name in ["windows", "rejected"] + ARTIFACT_CHECKS}
+
+    def push(self, samples):
+        """Add samples ((m,) or (channels, m)); returns (starts, flags) of the windows they complete."""
+        samples = np.atleast_2d(np.asarray(samples, dtype=np.float64))
+        if self._skip:
+            dropped = min(self._skip, samples.shape[-1])
+            samples = samples[:, dropped:]
+            self._skip -= dropped
+        buffer = samples if self._carry is None else np.concatenate([self._carry, samples], axis=-1)
+        n_windows = len(window_starts(buffer.shape[-1], self.window, self.step))
+        starts = self._next_start + np.arange(n_windows) * self.step
+        flags = artifact_flags(buffer, self.fs, self.window, self.step, self.thresholds)
+        for name, value in rejection_counts(flags, channel_axis=0).items():
+            self.counts[name] += value
+        consumed = n_windows * self.step
+        self._carry = buffer[:, consumed:].copy()
+        self._skip += max(consumed - buffer.shape[-1], 0)
+        self._next_start += consumed
+        return starts, flags
+
+
+def main():
+    import time
+
+    fs = 256
+    rng = np.random.default_rng(0)
+    x = 20 * np.sin(2 * np.pi * 10 * np.arange(fs * 3600) / fs) + rng.normal(0, 10, (4, fs * 3600))
+    x[:, fs * 100:fs * 101] += 300 * np.hanning(fs)  # blink
+    x[1, fs * 200] += 150  # electrode pop
+    x[2, fs * 300:fs * 301] += 40 * np.diff(rng.normal(0, 1, fs + 1))  # muscle burst (high-frequency noise)
+    start = time.perf_counter()
+    flags = artifact_flags(x, fs, fs, fs // 2)
+    elapsed = time.perf_counter() - start
+    counts = rejection_counts(flags, channel_axis=0)
+    print(f"1 h x 4 channels at {fs} Hz, 1 s windows, 50% overlap: {elapsed * 1000:.0f} ms, {counts}")
+
+    detector = StreamingArtifactDetector(fs, fs, fs // 2)
+    start = time.perf_counter()
+    for block in range(0, fs * 600, 32):
+        detector.push(x[:, block:block + 32])
+    elapsed = time.perf_counter() - start
+    print(f"streaming 10 min in 32-sample blocks: {elapsed / 600 * 1000:.2f} ms per second of signal, {detector.counts}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Band-power kernel shared by the segment, multi-window and streaming analyses
+#
+#   from band_power import band_powers
+#   bp = band_powers(windows, fs=128)                  # (..., 5) delta..gamma
+#   rel = band_powers(windows, fs=128, relative=True)  # fractions of total power
+#
+# Uses a real FFT over the last axis. The frequency bins, one-sided weights
+# and a (bins x bands) summation matrix are built once per (n, fs, bands) and
+# cached, so a call is one rfft, one squared magnitude and one matmul.
+#
+# Powers are in signal units squared: the bands of a window add up to its mean
+# square (Parseval), with bins outside every band (e.g. DC) counted only in the
+# total. A bin at frequency f belongs to a band when low <= f < high.
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+BANDS = OrderedDict([
+    ("delta", (0.5, 4)),
+    ("theta", (4, 8)),
+    ("alpha", (8, 13)),
+    ("beta", (13, 30)),
+    ("gamma", (30, 100)),
+])
+
+
+@lru_cache(maxsize=256)
+def band_plan(n, fs, bands=tuple(BANDS.values())):
+    """(freqs, weights, band_matrix) for n-sample windows at fs Hz; arrays are read-only."""
+    freqs = np.fft.rfftfreq(n, d=1 / fs)
+    # Each interior rfft bin stands for a positive and a negative frequency
+    weights = np.full(len(freqs), 2.0)
+    weights[0] = 1.0
+    if n % 2 == 0:
+        weights[-1] = 1.0
+    weights /= float(n) ** 2
+    masks = np.stack([(freqs >= low) & (freqs < high) for low, high in bands], axis=1)
+    band_matrix = masks * weights[:, None]
+    for array in (freqs, weights, band_matrix):
+        array.setflags(write=False)
+    return freqs, weights, band_matrix
+
+
+def band_powers(x, fs, bands=BANDS, relative=False):
+    """Power in every band for the last axis of x, shape (..., len(bands)).
+
+    relative=True divides by each window's total power (0 where it is zero).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    _, weights, band_matrix = band_plan(x.shape[-1], fs, tuple(bands.values()))
+    spectrum = np.fft.rfft(x, axis=-1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    powers = power @ band_matrix
+    if not relative:
+        return powers
+    total = (power @ weights)[..., None]
+    return np.divide(powers, total, out=np.zeros_like(powers), where=total != 0)
+
+
+def band_index(name, bands=BANDS):
+    return list(bands).index(name)
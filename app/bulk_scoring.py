@@ -0,0 +1,174 @@
+# Chunked bulk prediction for EEG feature CSV files of any size
+#
+#   python app/bulk_scoring.py recording.csv predictions.csv --workers 4
+#
+# The input is read CHUNK_ROWS rows at a time and each chunk is scored in a
+# worker process (every worker memory-maps the same compiled model artifact).
+# At most a few chunks are in flight at once and results are appended to the
+# output file in input order as soon as they are ready, so memory use depends
+# on the chunk size and worker count, not on the file size.
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from eeg_features import BAND_NAMES, derive_features
+from eeg_inference import EEG_FEATURES, score_batch
+from model_registry import DEFAULT_MODEL, get_registry
+
+CHUNK_ROWS = 50_000
+# Chunks queued per worker; bounds memory while keeping every worker busy
+IN_FLIGHT_PER_WORKER = 2
+# Workers used when none are asked for; each one holds a chunk and its results in memory
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+_worker_model = None
+
+
+# ================= WORKERS =================
+def _init_worker(model_name):
+    global _worker_model
+    _worker_model = get_registry().get(model_name)
+
+
+def _score_features(X):
+    labels, proba = score_batch(_worker_model, None, X)
+    return labels, proba
+
+
+def _result_frame(labels, proba, index):
+    return pd.DataFrame({
+        "prediction": np.where(labels == 1, "Study", "Phone"),
+        "pred_label": labels,
+        "study_prob": proba[:, 1],
+        "phone_prob": proba[:, 0],
+    }, index=index)
+
+
+# ================= BULK SCORING =================
+def _features(chunk, features):
+    missing = [name for name in features if name not in chunk.columns]
+    # Band powers alone are enough: the derived columns are computed on the fly
+    if missing and features == EEG_FEATURES and all(name in chunk.columns for name in BAND_NAMES):
+        return derive_features(chunk[BAND_NAMES].to_numpy())
+    if missing:
+        raise ValueError(f"Input is missing feature columns: {', '.join(missing)}")
+    return chunk[features].to_numpy(dtype=np.float64)
+
+
+def _estimate_rows(handle, sample_bytes=1 << 16):
+    """Row count guessed from the file size and the line length of the first block (None if unknown)."""
+    try:
+        start = handle.tell()
+        handle.seek(0, os.SEEK_END)
+        total_bytes = handle.tell() - start
+        handle.seek(start)
+        sample = handle.read(sample_bytes)
+        handle.seek(start)
+    except (AttributeError, OSError, ValueError):
+        return None
+    lines = sample.count(b"\n" if isinstance(sample, bytes) else "\n")
+    if lines < 2:
+        return None
+    # The first line is the header
+    return max(int(total_bytes / (len(sample) / lines)) - 1, 1)
+
+
+def score_csv(source, output_path, model_name=DEFAULT_MODEL, chunk_rows=CHUNK_ROWS, workers=None,
+              keep_columns=False, progress=None):
+    """Score every row of a CSV (path or file object) and write predictions to output_path.
+
+    workers=0 scores in this process; None uses DEFAULT_WORKERS. Workers are
+    spawned, not forked, so this is safe to call from a multi-threaded server.
+    progress(rows_done, fraction) is called after each chunk is written,
+    fraction is the share of the input consumed (None if unknown).
+    Returns (rows, seconds).
+    """
+    features = get_registry().spec(model_name).features
+    if workers is None:
+        workers = DEFAULT_WORKERS
+
+    handle = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    estimated_rows = _estimate_rows(handle)
+
+    def fraction():
+        return None if not estimated_rows else min(rows_done / estimated_rows, 1.0)
+
+    start = time.perf_counter()
+    rows_done = 0
+    header = True
+    # Convert (or validate) the artifact once here, so the workers only memory-map it
+    _init_worker(model_name)
+    pool = None
+    if workers:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"),
+                                   initializer=_init_worker, initargs=(model_name,))
+    try:
+        with open(output_path, "w", newline="") as out:
+            def write(chunk, labels, proba):
+                nonlocal header, rows_done
+                result = _result_frame(labels, proba, chunk.index)
+                if keep_columns:
+                    result = pd.concat([chunk, result], axis=1)
+                result.to_csv(out, header=header, index=False)
+                header = False
+                rows_done += len(result)
+                if progress is not None:
+                    progress(rows_done, fraction())
+
+            pending = []
+            for chunk in pd.read_csv(handle, chunksize=chunk_rows):
+                X = _features(chunk, features)
+                if pool is None:
+                    write(chunk, *_score_features(X))
+                    continue
+                pending.append((chunk if keep_columns else chunk.iloc[:, :0], pool.submit(_score_features, X)))
+                # Write finished chunks in order; wait on the oldest once the queue is full
+                while pending and (pending[0][1].done() or len(pending) >= workers * IN_FLIGHT_PER_WORKER):
+                    done_chunk, future = pending.pop(0)
+                    write(done_chunk, *future.result())
+            for done_chunk, future in pending:
+                write(done_chunk, *future.result())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if handle is not source:
+            handle.close()
+    return rows_done, time.perf_counter() - start
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a CSV of EEG feature rows in chunks.")
+    parser.add_argument("input", help="CSV with the model's feature columns (or just delta..gamma for EEG models)")
+    parser.add_argument("output", help="CSV to write predictions to")
+    parser.add_argument("--model", default=DEFAULT_MODEL, choices=get_registry().names())
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--workers", type=int, default=None, help=f"Worker processes (0 = score in this process, default: {DEFAULT_WORKERS})")
+    parser.add_argument("--keep-columns", action="store_true", help="Copy the input columns into the output")
+    args = parser.parse_args()
+
+    def report(rows, fraction):
+        share = f" ({fraction:.0%})" if fraction is not None else ""
+        print(f"\r{rows:,} rows scored{share}", end="", file=sys.stderr, flush=True)
+
+    try:
+        rows, seconds = score_csv(args.input, args.output, args.model, args.chunk_rows, args.workers,
+                                  args.keep_columns, report)
+    except ValueError as e:
+        # Bad input (missing feature columns, unparsable CSV): no traceback and no half-written output
+        print(f"\nError: {e}", file=sys.stderr)
+        if os.path.exists(args.output):
+            os.remove(args.output)
+        sys.exit(1)
+    print(f"\nWrote {rows:,} predictions to {args.output} in {seconds:.1f} s ({rows / max(seconds, 1e-9):,.0f} rows/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+# NumPy-only predictors compiled from a fitted scaler + sklearn classifier
+#
+# Export:
+#   python app/compiled_predictor.py --model final_eeg_model --check
+#
+# The predictor is written in the memory-mapped format of model_artifacts.
+#
+# Only the export step needs sklearn/joblib. Loading and predicting with a
+# compiled model uses plain NumPy arrays:
+#   - linear models and MLPs have the scaler folded into the first weight matrix
+#   - tree ensembles are flattened into node arrays (feature, threshold, left,
+#     right, value) and evaluated by forest_engine.PackedForest
+import numpy as np
+
+from forest_engine import ARRAY_NAMES, PackedForest, pack_trees
+
+
+# ================= SCALERS =================
+def _scaler_arrays(scaler, n_features):
+    """Describe a fitted scaler as an affine map x * mul + add, plus exact-order arrays for trees."""
+    if scaler is None:
+        return {"kind": "none", "mul": np.ones(n_features), "add": np.zeros(n_features)}
+
+    name = type(scaler).__name__
+    if name == "StandardScaler":
+        # sklearn fills mean_ / scale_ even when with_mean / with_std are off
+        mean = scaler.mean_ if scaler.with_mean and scaler.mean_ is not None else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.with_std and scaler.scale_ is not None else np.ones(n_features)
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+        return {"kind": "standard", "mean": mean, "scale": scale, "mul": 1.0 / scale, "add": -mean / scale}
+    if name == "MinMaxScaler":
+        if getattr(scaler, "clip", False):
+            raise ValueError("MinMaxScaler(clip=True) cannot be folded into an affine map")
+        return {"kind": "minmax", "scale": np.asarray(scaler.scale_, dtype=np.float64),
+                "min": np.asarray(scaler.min_, dtype=np.float64),
+                "mul": np.asarray(scaler.scale_, dtype=np.float64), "add": np.asarray(scaler.min_, dtype=np.float64)}
+    raise ValueError(f"Unsupported scaler: {name}")
+
+
+def _apply_scaler(arrays, meta, X):
+    # Same operation order as sklearn so tree thresholds see identical values
+    kind = meta["scaler"]
+    if kind == "standard":
+        return (X - arrays["scaler_mean"]) / arrays["scaler_scale"]
+    if kind == "minmax":
+        return X * arrays["scaler_scale"] + arrays["scaler_min"]
+    return X
+
+
+# ================= ACTIVATIONS =================
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+
+def _softmax(z):
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+_HIDDEN_ACTIVATIONS = {
+    "identity": lambda z: z,
+    "relu": lambda z: np.maximum(z, 0.0),
+    "tanh": np.tanh,
+    "logistic": _sigmoid,
+}
+
+
+def _binary_or_softmax(z):
+    if z.shape[1] == 1:
+        p = _sigmoid(z[:, 0])
+        return np.column_stack([1.0 - p, p])
+    return _softmax(z)
+
+
+# ================= COMPILATION =================
+def _compile_linear(model, affine):
+    W = np.asarray(model.coef_, dtype=np.float64).T  # (features, outputs)
+    b = np.asarray(model.intercept_, dtype=np.float64)
+    arrays = {"W": W * affine["mul"][:, None], "b": b + affine["add"] @ W}
+    return "linear", arrays, {}
+
+
+def _compile_mlp(model, affine):
+    arrays = {}
+    for i, (W, b) in enumerate(zip(model.coefs_, model.intercepts_)):
+        W = np.asarray(W, dtype=np.float64)
+        b = np.asarray(b, dtype=np.float64)
+        if i == 0:
+            W, b = W * affine["mul"][:, None], b + affine["add"] @ W
+        arrays[f"W{i}"] = W
+        arrays[f"b{i}"] = b
+    meta = {"n_layers": len(model.coefs_), "activation": model.activation, "out_activation": model.out_activation_}
+    return "mlp", arrays, meta
+
+
+def _compile_trees(model, affine):
+    arrays, max_depth = pack_trees(model)
+    for key in ("mean", "scale", "min"):
+        if key in affine:
+            arrays[f"scaler_{key}"] = affine[key]
+    return "trees", arrays, {"max_depth": max_depth, "scaler": affine["kind"]}
+
+
+def compile_pipeline(model, scaler=None):
+    """Merge a fitted scaler and classifier into a CompiledPredictor.
+
+    `model` may also be a sklearn Pipeline of [scaler, classifier].
+    """
+    if hasattr(model, "steps"):
+        if len(model.steps) != 2:
+            raise ValueError("Only [scaler, classifier] pipelines can be compiled")
+        if scaler is not None:
+            raise ValueError("Pass either a Pipeline or a separate scaler, not both")
+        scaler, model = model.steps[0][1], model.steps[1][1]
+
+    n_features = int(model.n_features_in_)
+    affine = _scaler_arrays(scaler, n_features)
+    name = type(model).__name__
+    if name == "LogisticRegression":
+        kind, arrays, meta = _compile_linear(model, affine)
+    elif name == "MLPClassifier":
+        kind, arrays, meta = _compile_mlp(model, affine)
+    elif name in ("RandomForestClassifier", "ExtraTreesClassifier", "DecisionTreeClassifier"):
+        kind, arrays, meta = _compile_trees(model, affine)
+    else:
+        raise ValueError(f"Unsupported model: {name}")
+
+    meta.update({"kind": kind, "model": name, "n_features": n_features})
+    classes = np.asarray(model.classes_)
+    return CompiledPredictor(kind, arrays, meta, classes)
+
+
+# ================= PREDICTOR =================
+class CompiledPredictor:
+    """Scaler + classifier evaluated with NumPy only. Accepts raw (unscaled) features."""
+
+    def __init__(self, kind, arrays, meta, classes):
+        self.kind = kind
+        self.arrays = arrays
+        self.meta = meta
+        self.classes_ = classes
+        self.n_features_in_ = meta["n_features"]
+        self.info = {}
+        if kind == "trees":
+            forest_arrays = {name: arrays[name] for name in ARRAY_NAMES}
+            self._forest = PackedForest(forest_arrays, meta["max_depth"], meta["n_features"])
+
+    def prepare(self, X):
+        """Raw features as the classifier sees them: 2-D float64, scaled for trees.
+
+        Linear models and MLPs have the scaler folded into their first layer,
+        so for them this is only the input conversion.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if self.kind == "trees":
+            return _apply_scaler(self.arrays, self.meta, X)
+        return X
+
+    def predict_proba_prepared(self, X):
+        """predict_proba() for input that already went through prepare()."""
+        if self.kind == "linear":
+            return _binary_or_softmax(X @ self.arrays["W"] + self.arrays["b"])
+        if self.kind == "mlp":
+            return self._mlp_proba(X)
+        return self._forest.predict_proba(X)
+
+    def predict_proba(self, X):
+        return self.predict_proba_prepared(self.prepare(X))
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    @property
+    def nbytes(self):
+        """Bytes held by the predictor arrays plus tables derived from them at load time."""
+        total = sum(array.nbytes for array in self.arrays.values())
+        if self.kind == "trees":
+            total += self._forest.derived_nbytes
+        return total
+
+    def _mlp_proba(self, X):
+        a = self.arrays
+        hidden = _HIDDEN_ACTIVATIONS[self.meta["activation"]]
+        n_layers = self.meta["n_layers"]
+        h = X
+        for i in range(n_layers):
+            h = h @ a[f"W{i}"] + a[f"b{i}"]
+            if i < n_layers - 1:
+                h = hidden(h)
+        if self.meta["out_activation"] == "softmax":
+            return _softmax(h)
+        p = _sigmoid(h[:, 0])
+        return np.column_stack([1.0 - p, p])
+
+
+# ================= VERIFICATION =================
+def check_against_sklearn(predictor, model, scaler, X, atol=1e-9):
+    """Compare compiled outputs with the sklearn pipeline; returns (max_abs_diff, label_agreement)."""
+    X_scaled = scaler.transform(X) if scaler is not None else X
+    expected = model.predict_proba(X_scaled)
+    got = predictor.predict_proba(X)
+    diff = float(np.max(np.abs(expected - got)))
+    agreement = float((model.predict(X_scaled) == predictor.predict(X)).mean())
+    if diff > atol:
+        raise AssertionError(f"Compiled predictor differs from sklearn by {diff:.3g} (atol {atol:g})")
+    return diff, agreement
+
+
+def main():
+    import argparse
+    import time
+    import joblib
+    import pandas as pd
+    from eeg_inference import DATA_PATH, EEG_FEATURES
+    from model_artifacts import artifact_path, load_artifact, model_info, save_artifact
+    from model_registry import DEFAULT_MODEL, MODEL_SPECS
+
+    eeg_models = [name for name, spec in MODEL_SPECS.items() if spec.features == EEG_FEATURES]
+    parser = argparse.ArgumentParser(description="Export a scaler + classifier as a NumPy-only predictor.")
+    parser.add_argument("--model", default=DEFAULT_MODEL, choices=eeg_models, help="Registry name; its matching scaler is folded in")
+    parser.add_argument("--out", default=None, help="Artifact directory (default: next to the model file)")
+    parser.add_argument("--check", action="store_true", help="Verify against sklearn on the EEG dataset")
+    args = parser.parse_args()
+
+    spec = MODEL_SPECS[args.model]
+    model = joblib.load(spec.path)
+    scaler = joblib.load(spec.scaler_path) if spec.scaler_path else None
+    predictor = compile_pipeline(model, scaler)
+    out = args.out or artifact_path(spec.path)
+    save_artifact(predictor, out, model_info(model, (spec.path, spec.scaler_path)))
+    print(f"Saved {predictor.meta['model']} ({predictor.kind}) to {out}")
+
+    if args.check:
+        predictor = load_artifact(out)
+        X = pd.read_csv(DATA_PATH)[EEG_FEATURES].to_numpy()
+        diff, agreement = check_against_sklearn(predictor, model, scaler, X)
+        print(f"Max |proba diff| vs sklearn: {diff:.3g}, label agreement: {agreement:.2%}")
+
+        row = X[:1]
+        start = time.perf_counter()
+        for _ in range(200):
+            predictor.predict_proba(row)
+        compiled_us = (time.perf_counter() - start) / 200 * 1e6
+        start = time.perf_counter()
+        for _ in range(20):
+            model.predict_proba(scaler.transform(row) if scaler is not None else row)
+        sklearn_us = (time.perf_counter() - start) / 20 * 1e6
+        print(f"Single-row latency: compiled {compiled_us:.0f} µs, sklearn {sklearn_us:.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
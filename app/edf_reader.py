@@ -0,0 +1,197 @@
+# Memory-mapped EDF / EDF+ / BDF reader in plain NumPy
+#
+#   edf = EDFFile("night.edf")
+#   edf.labels, edf.fs, edf.n_samples
+#   edf[:, 0:256 * 30]                       # (channels, samples) in physical units
+#   edf.select(["Fp1", "Fp2"])[:, a:b]
+#
+# Only the text header is parsed on open; the data records are memory-mapped,
+# so a multi-gigabyte file opens instantly and slicing a channel range or time
+# range only reads the pages it touches.
+#
+# Each data record holds `samples_per_record` samples of every signal in turn,
+# as little-endian int16 (EDF) or 24-bit two's complement (BDF). Digital values
+# are mapped to physical units with the per-signal (digital, physical) ranges.
+# Records are assumed back to back in time, so discontinuous EDF+D files are
+# rejected rather than read with silently wrong timing.
+import os
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+ANNOTATION_LABELS = ("EDF Annotations", "BDF Annotations")
+_SIGNAL_FIELDS = [
+    ("label", 16), ("transducer", 80), ("physical_dimension", 8), ("physical_min", 8), ("physical_max", 8),
+    ("digital_min", 8), ("digital_max", 8), ("prefiltering", 80), ("samples_per_record", 8), ("reserved", 32),
+]
+
+
+def _ascii(raw):
+    return raw.decode("ascii", errors="replace").strip()
+
+
+def read_header(path):
+    """Parse the fixed and per-signal EDF/BDF header fields into a dict."""
+    with open(path, "rb") as f:
+        fixed = f.read(256)
+        if len(fixed) < 256:
+            raise ValueError(f"{path} is too short to be an EDF/BDF file")
+        is_bdf = fixed[0] == 0xFF
+        n_signals = int(_ascii(fixed[252:256]))
+        raw = f.read(256 * n_signals)
+
+    header = {
+        "bdf": is_bdf,
+        "patient": _ascii(fixed[8:88]),
+        "recording": _ascii(fixed[88:168]),
+        "header_bytes": int(_ascii(fixed[184:192])),
+        "format": _ascii(fixed[192:236]),  # the fixed header's reserved field: "EDF+C", "EDF+D" or blank
+        "n_records": int(_ascii(fixed[236:244])),
+        "record_duration": float(_ascii(fixed[244:252])),
+        "n_signals": n_signals,
+    }
+    try:
+        header["start"] = datetime.strptime(_ascii(fixed[168:176]) + _ascii(fixed[176:184]), "%d.%m.%y%H.%M.%S")
+    except ValueError:
+        header["start"] = None
+
+    # Per-signal fields are stored field by field: all labels, then all transducers, ...
+    pos = 0
+    for name, width in _SIGNAL_FIELDS:
+        values = [_ascii(raw[pos + i * width:pos + (i + 1) * width]) for i in range(n_signals)]
+        pos += width * n_signals
+        if name in ("physical_min", "physical_max", "digital_min", "digital_max"):
+            values = np.array([float(v) for v in values])
+        elif name == "samples_per_record":
+            values = np.array([int(v) for v in values])
+        header[name] = values
+    return header
+
+
+class EDFFile:
+    """(channels x samples) view of an EDF/BDF file, decoded on slicing.
+
+    Channels must share one sampling rate; by default every signal at the most
+    common rate is used and annotation signals are skipped.
+    """
+
+    def __init__(self, path, channels=None):
+        self.path = path
+        self.header = header = read_header(path)
+        if header["format"].startswith("EDF+D"):
+            raise ValueError(f"{path} is a discontinuous EDF+D file; only continuous recordings are supported")
+        self.is_bdf = header["bdf"]
+        self._width = 3 if self.is_bdf else 2
+        spr = header["samples_per_record"]
+        self._record_samples = int(spr.sum())
+        self._offsets = np.concatenate([[0], np.cumsum(spr)[:-1]])
+
+        record_bytes = self._record_samples * self._width
+        n_records = header["n_records"]
+        if n_records < 0:  # -1 while recording; derive from the file size
+            n_records = (os.path.getsize(path) - header["header_bytes"]) // record_bytes
+        self.n_records = n_records
+        self._records = np.memmap(path, dtype=np.uint8, mode="r", offset=header["header_bytes"],
+                                  shape=(n_records, record_bytes))
+
+        gain = (header["physical_max"] - header["physical_min"]) / (header["digital_max"] - header["digital_min"])
+        self._gain = gain
+        self._offset = header["physical_min"] - header["digital_min"] * gain
+        self.all_labels = list(header["label"])
+
+        if channels is None:
+            data_signals = [i for i, label in enumerate(self.all_labels) if label not in ANNOTATION_LABELS]
+            common = Counter(spr[i] for i in data_signals).most_common(1)
+            channels = [i for i in data_signals if common and spr[i] == common[0][0]]
+        self._signals = [self._signal_index(ch) for ch in channels]
+        rates = {int(spr[i]) for i in self._signals}
+        if len(rates) > 1:
+            raise ValueError("Selected channels have different sampling rates")
+        self._spr = rates.pop() if rates else 0
+
+    def _signal_index(self, channel):
+        if isinstance(channel, (int, np.integer)):
+            return int(channel)
+        if channel not in self.all_labels:
+            raise KeyError(f"No channel '{channel}' in {self.path}")
+        return self.all_labels.index(channel)
+
+    def select(self, channels):
+        """New view restricted to channels (labels or signal indices)."""
+        return EDFFile(self.path, channels)
+
+    @property
+    def labels(self):
+        return [self.all_labels[i] for i in self._signals]
+
+    @property
+    def fs(self):
+        return self._spr / self.header["record_duration"]
+
+    @property
+    def n_samples(self):
+        return self.n_records * self._spr
+
+    @property
+    def shape(self):
+        return (len(self._signals), self.n_samples)
+
+    @property
+    def duration(self):
+        return self.n_records * self.header["record_duration"]
+
+    @property
+    def units(self):
+        return [self.header["physical_dimension"][i] for i in self._signals]
+
+    def _decode(self, raw):
+        if not self.is_bdf:
+            return raw.view("<i2").astype(np.float64)
+        b = raw.astype(np.int32).reshape(raw.shape[:-1] + (-1, 3))
+        value = b[..., 0] | (b[..., 1] << 8) | (b[..., 2] << 16)
+        return np.where(value >= 1 << 23, value - (1 << 24), value).astype(np.float64)
+
+    def read(self, start=0, stop=None):
+        """Physical values of the selected channels for samples [start, stop)."""
+        stop = self.n_samples if stop is None else min(stop, self.n_samples)
+        start = max(start, 0)
+        out = np.empty((len(self._signals), max(stop - start, 0)))
+        if stop <= start:
+            return out
+        first, last = start // self._spr, (stop - 1) // self._spr + 1
+        skip = start - first * self._spr
+        records = self._records[first:last]
+        w = self._width
+        for row, sig in enumerate(self._signals):
+            lo = self._offsets[sig] * w
+            # Only the bytes of this signal in the touched records are read
+            raw = np.ascontiguousarray(records[:, lo:lo + self._spr * w])
+            values = self._decode(raw).reshape(-1)[skip:skip + stop - start]
+            out[row] = values * self._gain[sig] + self._offset[sig]
+        return out
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key, slice(None))
+        rows, cols = key
+        if not isinstance(cols, slice) or cols.step not in (None, 1):
+            raise IndexError("Samples must be sliced with a contiguous slice")
+        start, stop, _ = cols.indices(self.n_samples)
+        if isinstance(rows, slice) and rows == slice(None):
+            view = self
+        else:
+            view = self.select(np.atleast_1d(np.asarray(self._signals)[rows]).tolist())
+        return view.read(start, stop)
+
+    def __reduce__(self):
+        # Worker processes reopen the file instead of receiving the mapped data
+        return EDFFile, (self.path, self._signals)
+
+    def __array__(self, dtype=None, copy=None):
+        data = self.read()
+        return data if dtype is None else data.astype(dtype)
+
+    def __repr__(self):
+        kind = "BDF" if self.is_bdf else "EDF"
+        return f"<{kind} {self.path}: {len(self._signals)} channels, {self.fs:g} Hz, {self.duration:,.0f} s>"
@@ -0,0 +1,101 @@
+# Derived EEG features computed from the five absolute band powers
+#
+#   from eeg_features import derive_features
+#   X = derive_features(bands)          # (rows x 5) -> (rows x 16) in EEG_FEATURES order
+#
+# The formulas reproduce the derived columns of data/eeg_clean.csv:
+#
+#   <band>_rel        band / (delta + theta + alpha + beta + gamma)
+#   alpha_beta_ratio  alpha / beta
+#   theta_beta_ratio  theta / beta
+#   engagement_index  beta / (alpha + theta)
+#   fatigue           (delta + theta) / alpha
+#   workload          gamma / theta
+#   calmness          alpha / (delta + theta)
+#
+# eeg_clean.csv was winsorized after the derived columns were computed: every
+# column is clipped to its 1st/99th percentile. Passing clip=training_clip_bounds()
+# applies the same bounds, so rows whose band powers were not clipped match the
+# CSV to floating-point precision.
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from eeg_inference import EEG_FEATURES, PROJECT_DIR
+
+BAND_NAMES = ["delta", "theta", "alpha", "beta", "gamma"]
+DERIVED_FEATURES = EEG_FEATURES[len(BAND_NAMES):]
+CLEAN_DATA_PATH = os.path.join(PROJECT_DIR, "data", "eeg_clean.csv")
+
+
+def derive_features(bands, dtype=np.float64, clip=None):
+    """All 16 model features for a (rows x 5) array of delta..gamma band powers.
+
+    Any leading shape works, e.g. (epochs, channels, 5) -> (epochs, channels, 16);
+    a single 1-D row gives (1, 16). dtype selects float64 or float32
+    arithmetic. clip is an optional (low, high) pair of 16-value arrays
+    applied to the output.
+    """
+    bands = np.asarray(bands, dtype=dtype)
+    if bands.ndim == 1:
+        bands = bands.reshape(1, -1)
+    if bands.shape[-1] != len(BAND_NAMES):
+        raise ValueError(f"Expected {len(BAND_NAMES)} band columns ({', '.join(BAND_NAMES)}), got {bands.shape[-1]}")
+    if bands.ndim > 2:
+        return derive_features(bands.reshape(-1, len(BAND_NAMES)), dtype, clip).reshape(bands.shape[:-1] + (len(EEG_FEATURES),))
+
+    out = np.empty((len(bands), len(EEG_FEATURES)), dtype=dtype)
+    out[:, :5] = bands
+    delta, theta, alpha, beta, gamma = bands.T
+    np.divide(bands, bands.sum(axis=1, keepdims=True), out=out[:, 5:10])
+    np.divide(alpha, beta, out=out[:, 10])
+    np.divide(theta, beta, out=out[:, 11])
+    np.divide(beta, alpha + theta, out=out[:, 12])
+    np.divide(delta + theta, alpha, out=out[:, 13])
+    np.divide(gamma, theta, out=out[:, 14])
+    np.divide(alpha, delta + theta, out=out[:, 15])
+    if clip is not None:
+        np.clip(out, np.asarray(clip[0], dtype=dtype), np.asarray(clip[1], dtype=dtype), out=out)
+    return out
+
+
+def derive_frame(df, dtype=np.float64, clip=None):
+    """DataFrame with the 16 EEG_FEATURES columns derived from df's band columns."""
+    import pandas as pd
+
+    return pd.DataFrame(derive_features(df[BAND_NAMES].to_numpy(), dtype, clip), columns=EEG_FEATURES, index=df.index)
+
+
+@lru_cache(maxsize=None)
+def training_clip_bounds(path=CLEAN_DATA_PATH):
+    """Per-feature (low, high) winsorizing bounds of the cleaned training data."""
+    import pandas as pd
+
+    values = pd.read_csv(path, usecols=EEG_FEATURES)[EEG_FEATURES].to_numpy()
+    low, high = values.min(axis=0), values.max(axis=0)
+    low.setflags(write=False)
+    high.setflags(write=False)
+    return low, high
+
+
+def main():
+    import time
+    import pandas as pd
+
+    df = pd.read_csv(CLEAN_DATA_PATH)
+    expected = df[EEG_FEATURES].to_numpy()
+    low, high = training_clip_bounds()
+    # Rows with a clipped band power lost the raw value their derived columns were computed from
+    unclipped = ((expected[:, :5] > low[:5]) & (expected[:, :5] < high[:5])).all(axis=1)
+    for dtype in (np.float64, np.float32):
+        start = time.perf_counter()
+        got = derive_features(df[BAND_NAMES].to_numpy(), dtype, (low, high))
+        elapsed = time.perf_counter() - start
+        diff = np.abs(got[unclipped] - expected[unclipped]).max()
+        print(f"{np.dtype(dtype).name}: {unclipped.sum():,} unclipped rows, max |diff| vs eeg_clean.csv {diff:.2g}, "
+              f"{len(df):,} rows in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Shared EEG classifier inference helpers used by the pages and tools
+import os
+from contextlib import nullcontext
+
+import numpy as np
+
+# ================= PATHS =================
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(APP_DIR)
+DATA_PATH = os.path.join(PROJECT_DIR, "data", "eeg study vs phone data.csv")
+MODELS_DIR = os.path.join(PROJECT_DIR, "models")
+MODEL_PATH = os.path.join(MODELS_DIR, "final_eeg_model.joblib")
+
+# ================= FEATURES =================
+EEG_FEATURES = ["delta", "theta", "alpha", "beta", "gamma", "delta_rel", "theta_rel", "alpha_rel", "beta_rel", "gamma_rel",
+                "alpha_beta_ratio", "theta_beta_ratio", "engagement_index", "fatigue", "workload", "calmness"]
+
+
+# ================= SCORING =================
+def _no_timer(stage):
+    return nullcontext()
+
+
+def score_batch(model, scaler, X, timer=None):
+    """Score a (rows x features) matrix in one vectorized pass.
+
+    Returns (labels, proba) where proba[:, 1] is the Study probability and
+    proba[:, 0] the Phone probability. `timer(stage)` may return a context
+    manager (see latency_stats) timing each stage:
+
+      transform      the separate scaler, or a compiled model's prepare()
+                     (its folded-in scaler: input conversion, plus scaling
+                     for trees)
+      predict_proba  the classifier itself
+      predict        picking the most probable class; the model is not run twice
+
+    Models without predict_proba only time "predict", which runs the model.
+    """
+    timer = timer or _no_timer
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    prepare = getattr(model, "prepare", None)
+    if scaler is not None:
+        with timer("transform"):
+            X = scaler.transform(X)
+    elif prepare is not None:
+        with timer("transform"):
+            X = prepare(X)
+    if not hasattr(model, "predict_proba"):
+        with timer("predict"):
+            labels = np.asarray(model.predict(X)).astype(np.int64)
+        return labels, np.full((len(X), 2), 0.5)
+    with timer("predict_proba"):
+        if scaler is None and prepare is not None:
+            proba = model.predict_proba_prepared(X)
+        else:
+            proba = model.predict_proba(X)
+        proba = np.asarray(proba, dtype=np.float64)
+    with timer("predict"):
+        labels = np.asarray(model.classes_)[np.argmax(proba, axis=1)].astype(np.int64)
+    return labels, proba
@@ -0,0 +1,104 @@
+# Welch PSD band powers for raw EEG recordings
+#
+#   python app/eeg_psd.py rec1.npy rec2.csv --fs 256 --out bands.csv
+#
+# Every recording is a (channels x samples) array (a 1-D array is one channel).
+# scipy.signal.welch averages the periodograms of overlapping segments, which
+# gives far steadier band powers than a single FFT of the whole signal. The
+# power in a band is the PSD integrated over it, so the five columns are in
+# signal units squared, like the delta..gamma columns of the dataset.
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+from scipy.signal import welch
+
+from band_power import BANDS
+from eeg_features import BAND_NAMES
+from recordings import load_recording
+
+DEFAULT_SEGMENT_SEC = 2.0
+DEFAULT_OVERLAP = 0.5
+
+
+@lru_cache(maxsize=128)
+def _welch_band_matrix(nperseg, fs, bands):
+    freqs = np.fft.rfftfreq(nperseg, d=1 / fs)
+    df = freqs[1] - freqs[0]
+    matrix = np.stack([(freqs >= low) & (freqs < high) for low, high in bands], axis=1) * df
+    matrix.setflags(write=False)
+    return matrix
+
+
+def welch_band_powers(x, fs, segment_sec=DEFAULT_SEGMENT_SEC, overlap=DEFAULT_OVERLAP, bands=BANDS):
+    """float32 band powers (..., len(bands)) from the Welch PSD of the last axis of x.
+
+    Segments are segment_sec long (shortened to the signal if needed) and
+    overlap by the given fraction.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    nperseg = min(int(round(segment_sec * fs)), x.shape[-1])
+    noverlap = min(int(round(nperseg * overlap)), nperseg - 1)
+    _, psd = welch(x, fs=fs, nperseg=nperseg, noverlap=noverlap, axis=-1)
+    return (psd @ _welch_band_matrix(nperseg, fs, tuple(bands.values()))).astype(np.float32)
+
+
+def _recording_band_powers(args):
+    recording, fs, segment_sec, overlap = args
+    return welch_band_powers(np.atleast_2d(recording), fs, segment_sec, overlap)
+
+
+def extract_band_powers(recordings, fs, segment_sec=DEFAULT_SEGMENT_SEC, overlap=DEFAULT_OVERLAP, workers=None):
+    """Band powers of many recordings as a DataFrame: recording, channel, delta..gamma (float32).
+
+    Recordings may differ in length and channel count. workers=0 runs in this
+    process; None uses one worker per core.
+    """
+    tasks = [(recording, fs, segment_sec, overlap) for recording in recordings]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers and len(tasks) > 1:
+        # Spawned, not forked: the caller may be a Streamlit server with threads running
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            results = list(pool.map(_recording_band_powers, tasks))
+    else:
+        results = [_recording_band_powers(task) for task in tasks]
+
+    frames = []
+    for i, powers in enumerate(results):
+        frame = pd.DataFrame(powers, columns=BAND_NAMES)
+        frame.insert(0, "channel", np.arange(len(powers)))
+        frame.insert(0, "recording", i)
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame({name: pd.Series(dtype=np.float32) for name in ["recording", "channel"] + BAND_NAMES})
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Welch PSD band powers (delta..gamma) for raw EEG recordings.")
+    parser.add_argument("recordings", nargs="+", help="EDF/BDF, .npy (channels x samples), raw float32 .f32 or CSV (one column per channel)")
+    parser.add_argument("--fs", type=float, required=True, help="Sampling rate in Hz")
+    parser.add_argument("--segment-sec", type=float, default=DEFAULT_SEGMENT_SEC)
+    parser.add_argument("--overlap", type=float, default=DEFAULT_OVERLAP)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default=None, help="CSV to write (default: print)")
+    args = parser.parse_args()
+
+    frame = extract_band_powers([load_recording(path) for path in args.recordings], args.fs,
+                                args.segment_sec, args.overlap, args.workers)
+    frame.insert(1, "file", [os.path.basename(args.recordings[i]) for i in frame["recording"]])
+    if args.out:
+        frame.to_csv(args.out, index=False)
+        print(f"Wrote {len(frame):,} rows to {args.out}")
+    else:
+        print(frame.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
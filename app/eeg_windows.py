@@ -0,0 +1,163 @@
+# Sliding-window features for long EEG signals without a Python loop per window
+#
+#   from eeg_windows import window_features
+#   feats = window_features(signals, fs=128, window=128, step=64)
+#   feats["variance"]      # shape (..., n_windows)
+#
+# Windows are a zero-copy strided view of the input, and mean, variance,
+# energy and relative band powers of every window (of every signal in a
+# stacked batch) come from a handful of vectorized reductions and one batched
+# call to the band_power kernel.
+from collections import OrderedDict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from band_power import BANDS, band_powers
+
+WINDOW_FEATURES = ["mean", "variance", "energy"] + [f"{band}_rel" for band in BANDS]
+# Working memory iter_window_features() allows one window_features() call; with
+# a small hop a chunk holds far more window samples than signal samples
+MAX_BATCH_BYTES = 64 * 1024 * 1024
+# Peak bytes per window sample in window_features(): the spectrum, its power and the centred copy for var()
+_BYTES_PER_WINDOW_SAMPLE = 32
+
+
+def sliding_windows(x, window, step=None):
+    """(..., n_windows, window) read-only view over the last axis of x.
+
+    step defaults to window (no overlap); any step >= 1 is allowed.
+    """
+    x = np.asarray(x)
+    step = window if step is None else step
+    if window < 1 or step < 1:
+        raise ValueError("window and step must be positive")
+    if x.shape[-1] < window:
+        return np.empty(x.shape[:-1] + (0, window), dtype=x.dtype)
+    return sliding_window_view(x, window, axis=-1)[..., ::step, :]
+
+
+def overlap_step(window, overlap):
+    """Hop size in samples for a window length and an overlap fraction in [0, 1)."""
+    if not 0 <= overlap < 1:
+        raise ValueError("overlap must be in [0, 1)")
+    return max(int(round(window * (1 - overlap))), 1)
+
+
+def window_starts(n_samples, window, step=None):
+    """Start index of every window sliding_windows() produces for n_samples."""
+    step = window if step is None else step
+    return np.arange(0, max(n_samples - window + 1, 0), step)
+
+
+def window_features(x, fs, window, step=None, artifacts=None):
+    """Mean, variance, energy and relative band powers of every window.
+
+    x is a 1-D signal or a stack of signals (..., samples). Returns a dict of
+    WINDOW_FEATURES -> arrays shaped (..., n_windows), plus "band_powers"
+    shaped (..., n_windows, bands). Relative powers are fractions of each
+    window's total spectral power (its mean square, see band_power).
+
+    artifacts (a dict of thresholds, {} for the defaults) adds the
+    artifacts.artifact_flags() of every window under "artifacts" and the
+    combined mask under "rejected".
+    """
+    x = np.asarray(x, dtype=np.float64)
+    w = sliding_windows(x, window, step)
+    feats = {
+        "mean": w.mean(axis=-1),
+        "variance": w.var(axis=-1),
+        "energy": np.einsum("...i,...i->...", w, w),
+    }
+    bands = BANDS
+    if artifacts is not None:
+        from artifacts import high_frequency_bands
+
+        # The high-frequency check shares the FFT of the band powers
+        bands = OrderedDict(BANDS, **high_frequency_bands(fs, artifacts))
+    powers = band_powers(w, fs, bands)
+    total = feats["energy"][..., None] / window
+    rel = np.divide(powers, total, out=np.zeros_like(powers), where=total != 0)
+    if artifacts is not None:
+        from artifacts import artifact_flags, high_frequency_ratio
+
+        hf_ratio = high_frequency_ratio(powers[..., len(BANDS):])
+        feats["artifacts"] = artifact_flags(x, fs, window, step, artifacts, hf_ratio=hf_ratio)
+        feats["rejected"] = feats["artifacts"]["rejected"]
+        powers, rel = powers[..., :len(BANDS)], rel[..., :len(BANDS)]
+    for i, band in enumerate(BANDS):
+        feats[f"{band}_rel"] = rel[..., i]
+    # Absolute band powers (..., n_windows, bands) for the multi-channel classifier
+    feats["band_powers"] = powers
+    return feats
+
+
+def iter_window_features(chunks, fs, window, step=None, artifacts=None, max_batch_bytes=MAX_BATCH_BYTES):
+    """window_features() over a signal that arrives in chunks of any size.
+
+    chunks yields (channels, m) or (m,) arrays. Windows that straddle chunk
+    boundaries are completed from a carry-over of at most window + step
+    samples, and the windows of a chunk are processed in batches of about
+    max_batch_bytes working memory, so the output matches one call on the
+    whole signal while memory stays bounded by the chunk size plus one batch
+    whatever the overlap. Yields (starts, feats) per batch, with the global
+    start sample of every new window and feature arrays shaped
+    (channels, n_windows). artifacts is passed on to window_features().
+    """
+    step = window if step is None else step
+    carry = None
+    carry_start = 0  # global sample index of the next window start
+    skip = 0  # samples still to drop before that start (hop > window)
+    for chunk in chunks:
+        chunk = np.atleast_2d(np.asarray(chunk, dtype=np.float64))
+        if skip:
+            dropped = min(skip, chunk.shape[-1])
+            chunk = chunk[:, dropped:]
+            skip -= dropped
+        buffer = chunk if carry is None or carry.shape[-1] == 0 else np.concatenate([carry, chunk], axis=-1)
+        n_windows = len(window_starts(buffer.shape[-1], window, step))
+        per_batch = max(int(max_batch_bytes // (_BYTES_PER_WINDOW_SAMPLE * window * buffer.shape[0])), 1)
+        for first in range(0, n_windows, per_batch):
+            count = min(per_batch, n_windows - first)
+            batch = buffer[:, first * step:(first + count - 1) * step + window]
+            feats = window_features(batch, fs, window, step, artifacts)
+            yield carry_start + (first + np.arange(count)) * step, feats
+        consumed = n_windows * step
+        carry = buffer[:, consumed:].copy() if consumed < buffer.shape[-1] else buffer[:, :0]
+        skip += max(consumed - buffer.shape[-1], 0)
+        carry_start += consumed
+
+
+def window_feature_frame(starts, feats, fs, channel_names=None):
+    """Long-format DataFrame (one row per channel and window) from window features."""
+    import pandas as pd
+
+    n_channels = feats["mean"].shape[0]
+    names = channel_names or [f"ch{i}" for i in range(n_channels)]
+    frame = pd.DataFrame({
+        "channel": np.repeat(np.asarray(names, dtype=object), len(starts)),
+        "start_s": np.tile(np.asarray(starts) / fs, n_channels),
+    })
+    for name in WINDOW_FEATURES:
+        frame[name] = feats[name].reshape(-1)
+    if "rejected" in feats:
+        frame["rejected"] = feats["rejected"].reshape(-1)
+    return frame
+
+
+def main():
+    import time
+
+    fs = 128
+    rng = np.random.default_rng(0)
+    x = np.sin(2 * np.pi * 10 * np.arange(fs * 3600) / fs) + rng.normal(0, 0.4, fs * 3600)
+    for overlap in (0.0, 0.5, 0.9):
+        step = overlap_step(fs, overlap)
+        start = time.perf_counter()
+        feats = window_features(x, fs, fs, step)
+        elapsed = time.perf_counter() - start
+        print(f"1 h at {fs} Hz, 1 s windows, {overlap:.0%} overlap: {feats['mean'].shape[-1]:,} windows in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
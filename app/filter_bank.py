@@ -0,0 +1,116 @@
+# Band-pass filter bank for the EEG bands (delta..gamma)
+#
+#   from filter_bank import filter_bands, StreamingFilterBank
+#   bands = filter_bands(x, fs=256)            # (..., 5, samples), zero phase
+#
+#   bank = StreamingFilterBank(fs=256, n_channels=2)
+#   out = bank.push(chunk)                     # (channels, 5, m), causal
+#
+# Each band is a Butterworth filter in second-order sections, designed once
+# per (fs, band, order) and cached. filter_bands() runs sosfiltfilt forwards
+# and backwards, so the bands line up in time with the input (offline use).
+# StreamingFilterBank runs sosfilt and carries the filter state from chunk to
+# chunk, so a signal filtered in pieces matches one call on the whole signal.
+# Every call filters all channels of a band at once.
+#
+# A band whose upper edge is at or above Nyquist becomes a high-pass filter;
+# a band that starts above Nyquist is empty and filters to zeros.
+from functools import lru_cache
+
+import numpy as np
+from scipy.signal import butter, sosfilt, sosfilt_zi, sosfiltfilt
+
+from band_power import BANDS
+
+DEFAULT_ORDER = 4
+
+
+@lru_cache(maxsize=256)
+def band_sos(fs, low, high, order=DEFAULT_ORDER):
+    """(sections, 6) SOS array for the band [low, high) Hz, or None if it is empty at fs.
+
+    The array is shared by every caller and must not be modified (scipy's
+    filters refuse read-only coefficients, so it is not flagged as such).
+    """
+    nyquist = fs / 2
+    if low >= nyquist:
+        return None
+    if high >= nyquist:
+        return butter(order, low, btype="highpass", fs=fs, output="sos")
+    return butter(order, [low, high], btype="bandpass", fs=fs, output="sos")
+
+
+def bank_sos(fs, bands=BANDS, order=DEFAULT_ORDER):
+    """SOS arrays (or None) for every band, in band order."""
+    return [band_sos(fs, low, high, order) for low, high in bands.values()]
+
+
+def filter_bands(x, fs, bands=BANDS, order=DEFAULT_ORDER):
+    """Zero-phase band-filtered copies of x, shape (..., len(bands), samples)."""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.zeros(x.shape[:-1] + (len(bands), x.shape[-1]))
+    if x.shape[-1] < 2:
+        return out
+    for i, sos in enumerate(bank_sos(fs, bands, order)):
+        if sos is not None:
+            # Short signals get a shorter edge padding than scipy's default
+            padlen = min(3 * (2 * len(sos) + 1), x.shape[-1] - 1)
+            out[..., i, :] = sosfiltfilt(sos, x, axis=-1, padlen=padlen)
+    return out
+
+
+class StreamingFilterBank:
+    """Causal band filtering of a multi-channel stream, state carried across chunks."""
+
+    def __init__(self, fs, bands=BANDS, n_channels=1, order=DEFAULT_ORDER):
+        self.fs = fs
+        self.bands = bands
+        self.n_channels = n_channels
+        self._sos = bank_sos(fs, bands, order)
+        self.reset()
+
+    def reset(self):
+        self._zi = None
+
+    def _initial_state(self, first):
+        # Steady state for a signal that has always been at its first value,
+        # so a DC offset does not ring through the filters on start-up
+        return [None if sos is None else sosfilt_zi(sos)[:, None, :] * first[None, :, None]
+                for sos in self._sos]
+
+    def push(self, samples):
+        """Filter samples ((m,) or (channels, m)); returns (channels, len(bands), m)."""
+        samples = np.asarray(samples, dtype=np.float64).reshape(self.n_channels, -1)
+        out = np.zeros((self.n_channels, len(self._sos), samples.shape[1]))
+        if samples.shape[1] == 0:
+            return out
+        if self._zi is None:
+            self._zi = self._initial_state(samples[:, 0])
+        for i, sos in enumerate(self._sos):
+            if sos is not None:
+                out[:, i], self._zi[i] = sosfilt(sos, samples, axis=-1, zi=self._zi[i])
+        return out
+
+    update = push
+
+
+def main():
+    import time
+
+    fs = 256
+    rng = np.random.default_rng(0)
+    x = rng.normal(0, 10, (8, fs * 600))
+    start = time.perf_counter()
+    filter_bands(x, fs)
+    print(f"zero phase, 8 channels x 10 min at {fs} Hz: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    bank = StreamingFilterBank(fs, n_channels=8)
+    start = time.perf_counter()
+    for block in range(0, x.shape[1], 32):
+        bank.push(x[:, block:block + 32])
+    elapsed = time.perf_counter() - start
+    print(f"streaming, 8 channels in 32-sample blocks: {elapsed / 600 * 1000:.2f} ms per second of signal")
+
+
+if __name__ == "__main__":
+    main()
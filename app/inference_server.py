@@ -0,0 +1,222 @@
+# Local HTTP inference server for the EEG classifier with request micro-batching
+#
+# Usage:
+#   python app/inference_server.py --port 8765 --window-ms 5
+#
+#   curl -X POST localhost:8765/predict -d '{"features": [13.37, 9.75, ...]}'
+#
+# Concurrent single-row requests that arrive within --window-ms of each other
+# are scored together in one vectorized call of the compiled model.
+import argparse
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from eeg_inference import EEG_FEATURES, score_batch
+from model_registry import DEFAULT_MODEL, MODEL_SPECS, get_registry
+
+CLASS_NAMES = ["phone", "study"]
+# Largest request body accepted by /predict (tens of thousands of rows)
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+
+# ================= MICRO-BATCHING =================
+class _PendingRequest:
+    def __init__(self, rows):
+        self.rows = rows
+        self.done = threading.Event()
+        self.labels = None
+        self.proba = None
+        self.error = None
+
+
+class MicroBatcher:
+    """Collects rows from many callers and scores them in shared batches.
+
+    The worker thread waits for the first request, keeps collecting for up to
+    `window_ms` (or until `max_batch` rows are queued) and then runs a single
+    score_batch() call for everything it gathered.
+    """
+
+    def __init__(self, model, scaler, window_ms=5.0, max_batch=256):
+        self.model = model
+        self.scaler = scaler
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, rows, timeout=30.0):
+        """Block until `rows` (n x features) are scored; returns (labels, proba)."""
+        request = _PendingRequest(rows)
+        self._queue.put(request)
+        if not request.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for the inference worker")
+        if request.error is not None:
+            raise request.error
+        return request.labels, request.proba
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        n_rows = len(batch[0].rows)
+        deadline = time.monotonic() + self.window
+        while n_rows < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            n_rows += len(request.rows)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                X = np.vstack([request.rows for request in batch])
+                labels, proba = score_batch(self.model, self.scaler, X)
+            except Exception as exc:
+                for request in batch:
+                    request.error = exc
+                    request.done.set()
+                continue
+
+            self.batches += 1
+            self.rows += len(X)
+            start = 0
+            for request in batch:
+                end = start + len(request.rows)
+                request.labels = labels[start:end]
+                request.proba = proba[start:end]
+                request.done.set()
+                start = end
+
+
+# ================= REQUEST PARSING =================
+def parse_rows(payload):
+    """Accept {"features": [...]}, {"features": {name: value}} or {"rows": [[...], ...]}."""
+    if "rows" in payload:
+        rows = payload["rows"]
+    elif "features" in payload:
+        features = payload["features"]
+        if isinstance(features, dict):
+            missing = [f for f in EEG_FEATURES if f not in features]
+            if missing:
+                raise ValueError(f"Missing features: {', '.join(missing)}")
+            features = [features[f] for f in EEG_FEATURES]
+        rows = [features]
+    else:
+        raise ValueError('Request body needs a "features" or "rows" field')
+
+    X = np.asarray(rows, dtype=np.float64)
+    if X.ndim != 2 or X.shape[1] != len(EEG_FEATURES) or len(X) == 0:
+        raise ValueError(f"Expected rows of {len(EEG_FEATURES)} features, got shape {list(X.shape)}")
+    if not np.isfinite(X).all():
+        raise ValueError("Features must be finite numbers")
+    return X
+
+
+# ================= HTTP SERVER =================
+class InferenceHandler(BaseHTTPRequestHandler):
+    server_version = "EEGInference/1.0"
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": "Not found"})
+            return
+        batcher = self.server.batcher
+        self._send_json(200, {
+            "status": "ok",
+            "model": getattr(batcher.model, "info", {}).get("model_type", type(batcher.model).__name__),
+            "features": EEG_FEATURES,
+            "batches": batcher.batches,
+            "rows": batcher.rows,
+        })
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": "Not found"})
+            return
+        length = self.headers.get("Content-Length", "0").strip()
+        # int() would also take "-1", "+5" or " 1_0 "; only plain digits are a valid length
+        if not length.isdigit() or not length.isascii() or int(length) > MAX_BODY_BYTES:
+            self._send_json(400, {"error": f"Content-Length must be an integer between 0 and {MAX_BODY_BYTES}"})
+            return
+        try:
+            X = parse_rows(json.loads(self.rfile.read(int(length)) or b"{}"))
+        except (ValueError, TypeError) as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+
+        try:
+            labels, proba = self.server.batcher.submit(X)
+        except Exception as exc:
+            self._send_json(500, {"error": str(exc)})
+            return
+
+        self._send_json(200, {
+            "labels": labels.tolist(),
+            "classes": [CLASS_NAMES[label] for label in labels],
+            "probabilities": proba.tolist(),
+        })
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class InferenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many clients connect at once; the socketserver default backlog of 5 resets them
+    request_queue_size = 128
+
+
+def make_server(model, scaler, host="127.0.0.1", port=8765, window_ms=5.0, max_batch=256, quiet=True):
+    server = InferenceServer((host, port), InferenceHandler)
+    server.batcher = MicroBatcher(model, scaler, window_ms=window_ms, max_batch=max_batch)
+    server.quiet = quiet
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the EEG classifier over HTTP on localhost.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--window-ms", type=float, default=5.0, help="Micro-batch collection window")
+    parser.add_argument("--max-batch", type=int, default=256, help="Maximum rows per batch")
+    parser.add_argument("--model", default=DEFAULT_MODEL, choices=[n for n, spec in MODEL_SPECS.items() if spec.features == EEG_FEATURES])
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    # The matching scaler is folded into the compiled model
+    model = get_registry().get(args.model)
+    server = make_server(model, None, args.host, args.port, args.window_ms, args.max_batch, quiet=not args.verbose)
+    print(f"Serving {model.info['model_type']} on http://{args.host}:{args.port} (window {args.window_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
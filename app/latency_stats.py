@@ -0,0 +1,91 @@
+# Process-wide rolling latency statistics for the inference hot path
+#
+#   from latency_stats import get_latency_store
+#   timer = get_latency_store().stage_timer("final_eeg_model")
+#   labels, proba = score_batch(model, None, X, timer=timer)
+#
+# Every (model, stage) pair keeps the last DEFAULT_WINDOW timings in a deque,
+# so percentiles describe recent traffic from all sessions of the app.
+import csv
+import io
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_WINDOW = int(os.environ.get("EEG_LATENCY_WINDOW", 1000))
+CSV_COLUMNS = ["model", "stage", "calls", "window", "mean_us", "p50_us", "p95_us", "p99_us", "max_us"]
+
+
+class LatencyStore:
+    """Rolling per-model, per-stage latency samples shared by every session."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def record(self, model, stage, seconds):
+        key = (model, stage)
+        with self._lock:
+            if key not in self._samples:
+                self._samples[key] = deque(maxlen=self.window)
+                self._calls[key] = 0
+            self._samples[key].append(seconds)
+            self._calls[key] += 1
+
+    @contextmanager
+    def timer(self, model, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(model, stage, time.perf_counter() - start)
+
+    def stage_timer(self, model):
+        """Callable taking a stage name, for score_batch(..., timer=...)."""
+        return lambda stage: self.timer(model, stage)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._calls.clear()
+
+    def summary(self):
+        """One row per (model, stage) with percentiles in microseconds."""
+        with self._lock:
+            snapshot = {key: (np.array(samples), self._calls[key]) for key, samples in self._samples.items()}
+        rows = []
+        for (model, stage), (samples, calls) in sorted(snapshot.items()):
+            us = samples * 1e6
+            p50, p95, p99 = np.percentile(us, [50, 95, 99])
+            rows.append({
+                "model": model,
+                "stage": stage,
+                "calls": calls,
+                "window": len(us),
+                "mean_us": round(float(us.mean()), 1),
+                "p50_us": round(float(p50), 1),
+                "p95_us": round(float(p95), 1),
+                "p99_us": round(float(p99), 1),
+                "max_us": round(float(us.max()), 1),
+            })
+        return rows
+
+    def to_csv(self):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(self.summary())
+        return buffer.getvalue()
+
+
+@lru_cache(maxsize=None)
+def get_latency_store():
+    """Process-wide store shared by every page and session."""
+    return LatencyStore()
@@ -0,0 +1,160 @@
+# Streaming wave chart for Live Waves (a small Streamlit v2 custom component)
+#
+#   resync = live_wave_chart(new_samples, end=total, fs=256, seconds=2, panels=PANELS, full=False)
+#
+# The browser keeps the last `seconds` of every panel in its own buffer and
+# draws them on a canvas. After the first (full) frame, each update carries
+# only the samples added since the previous one, so a frame is a few hundred
+# bytes instead of a whole serialized figure. If the browser notices a gap in
+# the sample count (e.g. the page was reloaded) it asks for a full frame,
+# which live_wave_chart() reports by returning True.
+import numpy as np
+import streamlit as st
+
+# Time-axis label spacings (s); the smallest one giving at most this many labels is used
+_X_TICKS = [0.5, 1, 2, 5, 10]
+_MAX_X_LABELS = 8
+
+_CSS = """
+canvas {
+    width: 100%;
+    display: block;
+    border-radius: 8px;
+}
+"""
+
+_JS = """
+const charts = new WeakMap();
+
+function draw(chart) {
+    const { canvas, config, waves, end } = chart;
+    const ratio = window.devicePixelRatio || 1;
+    const width = canvas.clientWidth || 800;
+    const height = config.height;
+    canvas.style.height = height + "px";
+    if (canvas.width !== Math.round(width * ratio) || canvas.height !== Math.round(height * ratio)) {
+        canvas.width = Math.round(width * ratio);
+        canvas.height = Math.round(height * ratio);
+    }
+    const ctx = canvas.getContext("2d");
+    ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+    ctx.fillStyle = config.background;
+    ctx.fillRect(0, 0, width, height);
+
+    const left = 60, right = 20, title = 30, axis = 36, gap = 12;
+    const capacity = Math.round(config.fs * config.seconds);
+    const panelHeight = (height - axis) / config.panels.length;
+    const plotWidth = width - left - right;
+    const [yMin, yMax] = config.y_range;
+    const xOf = (i) => left + plotWidth * i / Math.max(capacity - 1, 1);
+
+    config.panels.forEach((panel, p) => {
+        const wave = waves[p] || [];
+        const top = p * panelHeight + title;
+        const plotHeight = panelHeight - title - gap;
+        const yOf = (v) => top + plotHeight * (yMax - v) / (yMax - yMin);
+        const offset = capacity - wave.length;
+
+        ctx.fillStyle = "#E5E7EB";
+        ctx.font = "600 14px sans-serif";
+        ctx.textAlign = "center";
+        ctx.fillText(panel.title, left + plotWidth / 2, top - 10);
+
+        ctx.strokeStyle = config.grid;
+        ctx.fillStyle = config.text;
+        ctx.font = "11px sans-serif";
+        ctx.textAlign = "right";
+        ctx.lineWidth = 1;
+        for (const tick of config.y_ticks) {
+            ctx.beginPath();
+            ctx.moveTo(left, yOf(tick));
+            ctx.lineTo(left + plotWidth, yOf(tick));
+            ctx.stroke();
+            ctx.fillText(String(tick), left - 8, yOf(tick) + 4);
+        }
+        ctx.save();
+        ctx.translate(14, top + plotHeight / 2);
+        ctx.rotate(-Math.PI / 2);
+        ctx.textAlign = "center";
+        ctx.fillText("Amplitude", 0, 0);
+        ctx.restore();
+        if (wave.length < 2) return;
+
+        ctx.save();
+        ctx.beginPath();
+        ctx.rect(left, top, plotWidth, plotHeight);
+        ctx.clip();
+        ctx.beginPath();
+        ctx.moveTo(xOf(offset), yOf(0));
+        wave.forEach((v, i) => ctx.lineTo(xOf(offset + i), yOf(v)));
+        ctx.lineTo(xOf(offset + wave.length - 1), yOf(0));
+        ctx.closePath();
+        ctx.fillStyle = panel.fill;
+        ctx.fill();
+        ctx.beginPath();
+        wave.forEach((v, i) => (i ? ctx.lineTo : ctx.moveTo).call(ctx, xOf(offset + i), yOf(v)));
+        ctx.strokeStyle = panel.color;
+        ctx.lineWidth = 2;
+        ctx.stroke();
+        ctx.restore();
+    });
+
+    // Time axis under the last panel, in seconds since the stream started
+    const tEnd = end / config.fs;
+    const tStart = tEnd - (capacity - 1) / config.fs;
+    const base = height - axis + 4;
+    ctx.fillStyle = config.text;
+    ctx.font = "11px sans-serif";
+    ctx.textAlign = "center";
+    for (let t = Math.ceil(tStart / config.x_tick) * config.x_tick; t <= tEnd; t += config.x_tick) {
+        const x = left + plotWidth * (t - tStart) / (tEnd - tStart);
+        ctx.fillText(t.toFixed(1), x, base + 10);
+    }
+    ctx.fillText("Time (seconds)", left + plotWidth / 2, base + 28);
+}
+
+export default function (component) {
+    const { data, parentElement, setTriggerValue } = component;
+    if (!data) return;
+    let chart = charts.get(parentElement);
+    if (!data.full && (!chart || chart.end !== data.end - data.waves[0].length)) {
+        // Missed samples (reload, dropped message): ask Python for the whole window
+        setTriggerValue("resync", true);
+        return;
+    }
+    if (data.full) {
+        const canvas = chart ? chart.canvas : document.createElement("canvas");
+        if (!chart) parentElement.appendChild(canvas);
+        chart = { canvas, config: data.config, waves: data.waves };
+        charts.set(parentElement, chart);
+    } else {
+        const capacity = Math.round(chart.config.fs * chart.config.seconds);
+        chart.waves = chart.waves.map((wave, p) => wave.concat(data.waves[p]).slice(-capacity));
+    }
+    chart.end = data.end;
+    draw(chart);
+}
+"""
+
+_LIVE_CHART = st.components.v2.component("live_wave_chart", css=_CSS, js=_JS)
+
+
+def live_wave_chart(waves, end, fs, seconds, panels, full=False, height=420, y_range=(-1.5, 1.5),
+                    key="live_wave_chart"):
+    """Draw or extend the chart; returns True when the browser needs a full frame next.
+
+    waves is (panels, m): the whole window when full=True, otherwise only the
+    samples added since the previous call. end is the stream's sample count
+    after the last of them. panels is a list of (title, line color, fill color).
+    """
+    data = {"full": bool(full), "end": int(end), "waves": np.round(np.asarray(waves, dtype=np.float64), 4).tolist()}
+    if full:
+        data["config"] = {
+            "fs": fs, "seconds": seconds, "height": height, "y_range": list(y_range),
+            "y_ticks": [float(f"{sum(y_range) / 2 + k * (y_range[1] - y_range[0]) / 3:.3g}") for k in (-1, 0, 1)],
+            "x_tick": next((t for t in _X_TICKS if seconds / t <= _MAX_X_LABELS), _X_TICKS[-1]),
+            "panels": [{"title": title, "color": color, "fill": fill} for title, color, fill in panels],
+            "background": "#0E1117", "grid": "rgba(255,255,255,0.1)", "text": "#9CA3AF",
+        }
+    result = _LIVE_CHART(data=data, key=key, on_resync_change=lambda: None)
+    return bool(getattr(result, "resync", None))
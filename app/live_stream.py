@@ -0,0 +1,158 @@
+# Live signal store and background producer for the Live Waves page
+#
+#   stream = LiveStream(fs=256, n_channels=2, capacity=256 * 10)
+#   producer = SampleProducer(stream, source)      # source(n) -> (channels, n)
+#   producer.start()
+#   ...
+#   waves, total = stream.read(512)                 # newest 512 samples, any thread
+#
+# LiveStream keeps the raw samples, their band-filtered copies and sliding
+# band powers together behind one lock, so a writer (the producer thread, or
+# a network receiver) and the page reading it never see a half-written block.
+#
+# SampleProducer runs in a daemon thread and writes samples at the true
+# sampling rate: every `block_seconds` it asks the source for however many
+# samples are due by the wall clock, so the signal speed does not depend on
+# how often the page renders. A page that renders slowly just sees bigger
+# jumps between frames. The producer stops by itself when nobody has called
+# touch() for `idle_timeout` seconds (e.g. the browser tab was closed).
+import threading
+import time
+
+import numpy as np
+
+from band_power import BANDS
+from filter_bank import StreamingFilterBank
+from ring_buffer import RingBuffer
+from streaming_bands import SlidingBandPower
+
+DEFAULT_BLOCK_SECONDS = 0.02
+DEFAULT_IDLE_TIMEOUT = 30.0
+
+
+class LiveStream:
+    """Thread-safe ring buffer of a live signal with filtered bands and band powers."""
+
+    def __init__(self, fs, n_channels, capacity, band_window=None):
+        self.fs = fs
+        self.n_channels = n_channels
+        self.capacity = capacity
+        self.lock = threading.RLock()
+        self.buffer = RingBuffer(capacity, n_channels)
+        # Bands of every channel: rows are channel 0 delta..gamma, channel 1 delta..gamma, ...
+        self.filtered = RingBuffer(capacity, n_channels * len(BANDS))
+        self.tracker = SlidingBandPower(fs, band_window or fs, n_channels=n_channels)
+        self.filter_bank = StreamingFilterBank(fs, n_channels=n_channels)
+
+    @property
+    def total(self):
+        """Samples written since the last reset."""
+        return self.buffer.total
+
+    def reset(self, samples=None):
+        """Forget everything, then optionally start from a (channels, m) block."""
+        with self.lock:
+            self.buffer.clear()
+            self.filtered.clear()
+            self.tracker.reset()
+            self.filter_bank.reset()
+        if samples is not None:
+            self.write(samples)
+
+    def write(self, samples):
+        """Append a (channels, m) block to the buffers, filters and band tracker."""
+        samples = np.asarray(samples, dtype=np.float64).reshape(self.n_channels, -1)
+        with self.lock:
+            self.buffer.extend(samples)
+            self.filtered.extend(self.filter_bank.push(samples).reshape(-1, samples.shape[1]))
+            self.tracker.update(samples)
+
+    def read(self, n=None, band=None):
+        """(copy of the newest n samples, total written); band (index into BANDS) reads that filtered band."""
+        with self.lock:
+            if band is None:
+                waves = self.buffer.view(n).copy()
+            else:
+                waves = self.filtered.view(n).reshape(self.n_channels, len(BANDS), -1)[:, band].copy()
+            return waves, self.buffer.total
+
+    def read_since(self, seen, window, band=None):
+        """(waves, total, full): the samples written after the first `seen`.
+
+        When that is not possible in one piece (seen is None, ahead of the
+        stream or more than `window` samples behind) the newest `window`
+        samples are returned instead with full=True.
+        """
+        with self.lock:
+            total = self.buffer.total
+            full = seen is None or not 0 <= total - seen <= window
+            waves, total = self.read(window if full else total - seen, band)
+        return waves, total, full
+
+
+class SampleProducer:
+    """Daemon thread that feeds a LiveStream from source(n) at the stream's sampling rate."""
+
+    def __init__(self, stream, source, block_seconds=DEFAULT_BLOCK_SECONDS, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.stream = stream
+        self.source = source
+        self.block_seconds = block_seconds
+        self.idle_timeout = idle_timeout
+        self.produced = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self._last_touch = time.monotonic()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return self
+        self._stop.clear()
+        self.touch()
+        self._thread = threading.Thread(target=self._run, name="live-sample-producer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def touch(self):
+        """Tell the producer someone is still watching."""
+        self._last_touch = time.monotonic()
+
+    def _run(self):
+        start = time.monotonic()
+        produced = 0
+        while not self._stop.wait(self.block_seconds):
+            now = time.monotonic()
+            if now - self._last_touch > self.idle_timeout:
+                break
+            # Catch up to the wall clock, however late this wake-up was
+            due = int((now - start) * self.stream.fs) - produced
+            if due > 0:
+                self.stream.write(self.source(due))
+                produced += due
+                self.produced += due
+
+
+def main():
+    from synthetic_eeg import SyntheticSource
+
+    fs = 256
+    stream = LiveStream(fs, n_channels=2, capacity=fs * 10)
+    producer = SampleProducer(stream, SyntheticSource(np.full((2, len(BANDS)), 0.2), fs)).start()
+    start = time.monotonic()
+    time.sleep(3)
+    producer.stop()
+    elapsed = time.monotonic() - start
+    print(f"produced {stream.total} samples in {elapsed:.2f} s ({stream.total / elapsed:.1f} Hz, target {fs} Hz)")
+
+
+if __name__ == "__main__":
+    main()
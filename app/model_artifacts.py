@@ -0,0 +1,209 @@
+# Memory-mapped model artifacts for the compiled EEG predictors
+#
+# An artifact is a directory next to the joblib file it was converted from:
+#
+#   models/final_eeg_model.eegm/
+#       header.json      format version, predictor kind/meta, classes, array
+#                        dtypes/shapes, model info, source file stamps and
+#                        the name of the data directory below
+#       v-<id>/
+#           feature.npy  one raw .npy block per predictor array
+#           threshold.npy
+#           ...
+#
+# Arrays are opened with np.load(mmap_mode="r"), so loading does no
+# unpickling and no sklearn import, and every process that maps the same
+# files shares the same physical pages through the OS page cache.
+#
+# Several processes may convert the same model at once (e.g. server workers
+# on a fresh checkout). Each writes its arrays into its own new v-<id>
+# directory and then publishes it by atomically replacing header.json, so a
+# reader always sees a complete header pointing at complete arrays. Data
+# directories that are no longer referenced are removed only after
+# STALE_SECONDS, and a load that still races a removal re-reads the header.
+#
+# Convert everything in models/:
+#   python app/model_artifacts.py
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+
+from compiled_predictor import CompiledPredictor
+
+FORMAT_NAME = "eeg-compiled-model"
+FORMAT_VERSION = 2
+ARTIFACT_SUFFIX = ".eegm"
+HEADER_FILE = "header.json"
+DATA_PREFIX = "v-"
+# Superseded data directories are kept this long for readers that already have the old header
+STALE_SECONDS = 60
+LOAD_ATTEMPTS = 3
+
+
+def artifact_path(model_path):
+    return os.path.splitext(model_path)[0] + ARTIFACT_SUFFIX
+
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def model_info(model, sources=()):
+    """Metadata the pages show about a model, kept in the artifact header."""
+    estimator = model.steps[-1][1] if hasattr(model, "steps") else model
+    info = {"model_type": type(estimator).__name__}
+    if hasattr(estimator, "n_estimators"):
+        info["n_estimators"] = int(estimator.n_estimators)
+    if hasattr(model, "feature_names_in_"):
+        info["feature_names"] = [str(name) for name in model.feature_names_in_]
+    if hasattr(estimator, "feature_importances_"):
+        info["feature_importances"] = [float(v) for v in estimator.feature_importances_]
+    info["sources"] = {os.path.basename(path): _file_stamp(path) for path in sources if path}
+    return info
+
+
+# ================= SAVE / LOAD =================
+def save_artifact(predictor, path, info=None):
+    """Write a CompiledPredictor as a new data directory, then publish it by replacing header.json."""
+    version = f"{DATA_PREFIX}{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+    data_path = os.path.join(path, version)
+    os.makedirs(data_path)
+
+    arrays = {}
+    for name, array in predictor.arrays.items():
+        array = np.ascontiguousarray(array)
+        np.save(os.path.join(data_path, f"{name}.npy"), array)
+        arrays[name] = {"dtype": array.dtype.str, "shape": list(array.shape)}
+
+    header = {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "data": version,
+        "kind": predictor.kind,
+        "meta": predictor.meta,
+        "classes": predictor.classes_.tolist(),
+        "arrays": arrays,
+        "info": info if info is not None else predictor.info,
+    }
+    tmp_header = os.path.join(path, f"{HEADER_FILE}.tmp-{version}")
+    with open(tmp_header, "w") as f:
+        json.dump(header, f, indent=2)
+    os.replace(tmp_header, os.path.join(path, HEADER_FILE))
+    _remove_stale(path, keep=version)
+    return path
+
+
+def _remove_stale(path, keep):
+    """Delete superseded data directories (and files of older formats) once nobody can still be opening them."""
+    cutoff = time.time() - STALE_SECONDS
+    for entry in os.scandir(path):
+        if entry.name in (keep, HEADER_FILE):
+            continue
+        try:
+            if entry.stat().st_mtime > cutoff:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                os.remove(entry.path)
+        except OSError:
+            # Already removed by another process, or still mapped (Windows)
+            pass
+
+
+def read_header(path):
+    with open(os.path.join(path, HEADER_FILE)) as f:
+        header = json.load(f)
+    if header.get("format") != FORMAT_NAME or header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} {FORMAT_NAME} artifact")
+    return header
+
+
+def load_artifact(path):
+    """Open an artifact with every array memory-mapped read-only."""
+    for attempt in range(LOAD_ATTEMPTS):
+        header = read_header(path)
+        data_path = os.path.join(path, header["data"])
+        try:
+            arrays = {name: np.load(os.path.join(data_path, f"{name}.npy"), mmap_mode="r") for name in header["arrays"]}
+            break
+        except FileNotFoundError:
+            # Superseded and removed between reading the header and the arrays: read the new header
+            if attempt == LOAD_ATTEMPTS - 1:
+                raise
+            time.sleep(0.05)
+    predictor = CompiledPredictor(header["kind"], arrays, header["meta"], np.asarray(header["classes"]))
+    predictor.info = header["info"]
+    return predictor
+
+
+def is_current(path, sources):
+    """True if the artifact exists and was converted from the current source files."""
+    if not os.path.exists(os.path.join(path, HEADER_FILE)):
+        return False
+    try:
+        stamps = read_header(path)["info"].get("sources", {})
+    except (OSError, ValueError):
+        return False
+    return stamps == {os.path.basename(src): _file_stamp(src) for src in sources if src}
+
+
+# ================= CONVERSION =================
+def convert(model_path, scaler_path=None, out_path=None):
+    """Compile a joblib model (+ scaler) and write it as an artifact."""
+    import joblib
+    from compiled_predictor import compile_pipeline
+
+    model = joblib.load(model_path)
+    scaler = joblib.load(scaler_path) if scaler_path else None
+    predictor = compile_pipeline(model, scaler)
+    out_path = out_path or artifact_path(model_path)
+    save_artifact(predictor, out_path, model_info(model, (model_path, scaler_path)))
+    return out_path
+
+
+def load_or_convert(model_path, scaler_path=None):
+    """Memory-map the artifact for model_path, converting it first if missing or stale.
+
+    If the models directory is read-only the freshly compiled predictor is
+    returned without being written.
+    """
+    path = artifact_path(model_path)
+    try:
+        if not is_current(path, (model_path, scaler_path)):
+            convert(model_path, scaler_path, path)
+        return load_artifact(path)
+    except (OSError, ValueError):
+        # Read-only models directory, or an artifact we could not read back
+        import joblib
+        from compiled_predictor import compile_pipeline
+
+        model = joblib.load(model_path)
+        predictor = compile_pipeline(model, joblib.load(scaler_path) if scaler_path else None)
+        predictor.info = model_info(model, (model_path, scaler_path))
+        return predictor
+
+
+def main():
+    # Model/scaler pairs come from the registry
+    from model_registry import MODEL_SPECS
+
+    for spec in MODEL_SPECS.values():
+        if not os.path.exists(spec.path):
+            continue
+        path = convert(spec.path, spec.scaler_path)
+
+        start = time.perf_counter()
+        predictor = load_artifact(path)
+        load_ms = (time.perf_counter() - start) * 1000
+        size_kb = sum(a.nbytes for a in predictor.arrays.values()) / 1024
+        print(f"{spec.filename} -> {os.path.basename(path)} ({predictor.kind}, {size_kb:.0f} KB, loads in {load_ms:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# Registry of every model artifact in models/ with lazy loading and LRU eviction
+#
+#   from model_registry import get_registry
+#   model = get_registry().get("final_eeg_model")
+#   model.predict_proba(X)   # raw features, the matching scaler is folded in
+#
+# Models are loaded (as memory-mapped compiled artifacts) on first use. Once
+# the resident size of loaded models exceeds the memory budget, the least
+# recently used ones are dropped until it fits again.
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from eeg_inference import EEG_FEATURES, MODELS_DIR
+from model_artifacts import load_or_convert
+
+MFCC_FEATURES = [f"mfcc{i}" for i in range(1, 40)]
+
+DEFAULT_MODEL = "final_eeg_model"
+DEFAULT_BUDGET_MB = float(os.environ.get("EEG_MODEL_BUDGET_MB", 64))
+
+
+class ModelSpec:
+    """What the pages need to know about a model without loading it."""
+
+    def __init__(self, name, filename, scaler, features, model_type, description):
+        self.name = name
+        self.filename = filename
+        self.scaler = scaler
+        self.features = features
+        self.model_type = model_type
+        self.description = description
+
+    @property
+    def path(self):
+        return os.path.join(MODELS_DIR, self.filename)
+
+    @property
+    def scaler_path(self):
+        return os.path.join(MODELS_DIR, SCALERS[self.scaler]["filename"]) if self.scaler else None
+
+
+# Scaler files and the features they were fitted on
+SCALERS = {
+    "scaler": {"filename": "scaler.joblib", "type": "MinMaxScaler", "features": EEG_FEATURES},
+    "scaler (1)": {"filename": "scaler (1).joblib", "type": "StandardScaler", "features": EEG_FEATURES},
+}
+
+# Matching scalers were checked against the labelled dataset: the two 300-tree
+# forests were fitted on raw features (100% accuracy unscaled, 79.9% through
+# scaler.joblib) and best_model on MinMax-scaled features. scaler (1).joblib
+# does not belong to any shipped model.
+MODEL_SPECS = OrderedDict((spec.name, spec) for spec in [
+    ModelSpec("final_eeg_model", "final_eeg_model.joblib", None, EEG_FEATURES, "RandomForestClassifier",
+              "Random Forest (300 trees) used by the app"),
+    ModelSpec("eeg_classifier", "eeg_classifier.joblib", None, EEG_FEATURES, "RandomForestClassifier",
+              "Random Forest (300 trees)"),
+    ModelSpec("best_model", "best_model.joblib", "scaler", EEG_FEATURES, "RandomForestClassifier",
+              "Random Forest (200 trees) on MinMax-scaled features"),
+    ModelSpec("mfcc_classifier", "mfcc_classifier.joblib", None, MFCC_FEATURES, "LogisticRegression",
+              "Logistic Regression pipeline on MFCC audio features"),
+])
+
+
+class _Entry:
+    def __init__(self, model, load_seconds, nbytes):
+        self.model = model
+        self.load_seconds = load_seconds
+        self.nbytes = nbytes
+
+
+class ModelRegistry:
+    """Loads models by name on first use and evicts the least recently used over budget."""
+
+    def __init__(self, specs=MODEL_SPECS, budget_mb=DEFAULT_BUDGET_MB):
+        self.specs = specs
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._loaded = OrderedDict()
+        self._stats = {name: {"loads": 0, "hits": 0, "evictions": 0, "load_seconds": None, "nbytes": None}
+                       for name in specs}
+        self._lock = threading.RLock()
+
+    def names(self):
+        return list(self.specs)
+
+    def available(self, name):
+        """True if the model file is on disk, checked without loading it."""
+        return os.path.exists(self.spec(name).path)
+
+    def spec(self, name):
+        if name not in self.specs:
+            raise KeyError(f"Unknown model '{name}'. Available: {', '.join(self.specs)}")
+        return self.specs[name]
+
+    def get(self, name):
+        """Return the compiled predictor for `name`, loading it if needed."""
+        spec = self.spec(name)
+        with self._lock:
+            if name in self._loaded:
+                self._loaded.move_to_end(name)
+                self._stats[name]["hits"] += 1
+                return self._loaded[name].model
+
+            start = time.perf_counter()
+            model = load_or_convert(spec.path, spec.scaler_path)
+            entry = _Entry(model, time.perf_counter() - start, model.nbytes)
+            self._loaded[name] = entry
+            stats = self._stats[name]
+            stats["loads"] += 1
+            stats["load_seconds"] = entry.load_seconds
+            stats["nbytes"] = entry.nbytes
+            self._evict(keep=name)
+            return model
+
+    def _evict(self, keep):
+        while self.resident_bytes() > self.budget_bytes and len(self._loaded) > 1:
+            name = next(iter(self._loaded))
+            if name == keep:
+                break
+            del self._loaded[name]
+            self._stats[name]["evictions"] += 1
+
+    def set_budget(self, budget_mb):
+        with self._lock:
+            self.budget_bytes = int(budget_mb * 1024 * 1024)
+            if self._loaded:
+                self._evict(keep=next(reversed(self._loaded)))
+
+    def resident_bytes(self):
+        with self._lock:
+            return sum(entry.nbytes for entry in self._loaded.values())
+
+    def stats(self):
+        """One row per model: load state, last load time, resident size and cache counters."""
+        with self._lock:
+            rows = []
+            for name, spec in self.specs.items():
+                stats = self._stats[name]
+                rows.append({
+                    "model": name,
+                    "file": spec.filename,
+                    "type": spec.model_type,
+                    "scaler": SCALERS[spec.scaler]["filename"] if spec.scaler else "—",
+                    "features": len(spec.features),
+                    "loaded": name in self._loaded,
+                    "load_ms": None if stats["load_seconds"] is None else stats["load_seconds"] * 1000,
+                    "resident_kb": None if stats["nbytes"] is None else stats["nbytes"] / 1024,
+                    "loads": stats["loads"],
+                    "hits": stats["hits"],
+                    "evictions": stats["evictions"],
+                })
+            return rows
+
+
+@lru_cache(maxsize=None)
+def get_registry():
+    """Process-wide registry shared by every page and session."""
+    return ModelRegistry()
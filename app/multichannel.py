@@ -0,0 +1,102 @@
+# Multi-channel EEG features and predictions for the 16-feature classifiers
+#
+#   powers = channel_band_powers(x, fs)           # (channels, samples) -> (channels, 5)
+#   feats = channel_features(x, fs)               # -> (channels, 16)
+#   X = aggregate_channels(powers, "mean")        # -> (16,) classifier input
+#   windows = predict_recording(model, x, fs, window=fs)
+#
+# Everything is vectorized over any leading shape, so (epochs, channels,
+# samples) batches go through one rfft and one derive_features() call.
+#
+# The classifiers were trained on one 16-feature row per sample. The
+# aggregation strategy decides how a headset's channels become that row:
+#   mean / median / max   combine the channels' band powers, then derive
+#                         the ratio features from the combined powers
+#   features_mean         derive the 16 features per channel, then average
+import numpy as np
+import pandas as pd
+
+from band_power import band_powers
+from eeg_features import derive_features
+from eeg_inference import EEG_FEATURES, score_batch
+from eeg_windows import window_features
+
+AGGREGATIONS = ["mean", "median", "max", "features_mean"]
+
+
+def channel_band_powers(x, fs, method="fft", **welch_options):
+    """(..., channels, 5) delta..gamma powers of a (..., channels, samples) array.
+
+    method="welch" uses eeg_psd.welch_band_powers (segment_sec, overlap options).
+    """
+    if method == "welch":
+        from eeg_psd import welch_band_powers
+
+        return welch_band_powers(x, fs, **welch_options).astype(np.float64)
+    return band_powers(x, fs)
+
+
+def channel_features(x, fs, method="fft", **welch_options):
+    """(..., channels, 16) model features per channel."""
+    return derive_features(channel_band_powers(x, fs, method, **welch_options))
+
+
+def aggregate_channels(powers, strategy="mean", weights=None):
+    """Collapse the channel axis of (..., channels, 5) band powers into (..., 16) features.
+
+    weights (one per channel) turn "mean" and "features_mean" into weighted
+    averages, e.g. to down-weight noisy electrodes. "median" and "max" take
+    no weights.
+    """
+    powers = np.asarray(powers, dtype=np.float64)
+    if weights is not None and strategy in ("median", "max"):
+        raise ValueError(f"Aggregation '{strategy}' does not support weights; use 'mean' or 'features_mean'")
+    if strategy == "features_mean":
+        return np.average(derive_features(powers), axis=-2, weights=weights)
+    if strategy == "mean":
+        combined = np.average(powers, axis=-2, weights=weights)
+    elif strategy == "median":
+        combined = np.median(powers, axis=-2)
+    elif strategy == "max":
+        combined = powers.max(axis=-2)
+    else:
+        raise ValueError(f"Unknown aggregation '{strategy}'. Choose from: {', '.join(AGGREGATIONS)}")
+    return derive_features(combined).reshape(combined.shape[:-1] + (len(EEG_FEATURES),))
+
+
+def predict_band_powers(model, powers, strategy="mean", weights=None, timer=None):
+    """(labels, proba) for (epochs, channels, 5) band powers; timer is passed to score_batch."""
+    X = aggregate_channels(powers, strategy, weights)
+    return score_batch(model, None, X.reshape(-1, X.shape[-1]), timer=timer)
+
+
+def predict_recording(model, x, fs, window, step=None, strategy="mean", weights=None):
+    """Classify every window of a (channels, samples) recording; one row per window."""
+    feats = window_features(np.atleast_2d(x), fs, window, step)
+    # (channels, windows, 5) -> (windows, channels, 5)
+    powers = np.swapaxes(feats["band_powers"], 0, 1)
+    labels, proba = predict_band_powers(model, powers, strategy, weights)
+    starts = np.arange(len(labels)) * (window if step is None else step)
+    return pd.DataFrame({"start_s": starts / fs, "label": labels, "study_prob": proba[:, 1]})
+
+
+def main():
+    import time
+    from model_registry import DEFAULT_MODEL, get_registry
+
+    model = get_registry().get(DEFAULT_MODEL)
+    fs = 256
+    rng = np.random.default_rng(0)
+    for n_channels in (8, 32, 64):
+        x = rng.normal(0, 1, (n_channels, fs))
+        timings = []
+        for _ in range(50):
+            start = time.perf_counter()
+            predict_band_powers(model, channel_band_powers(x, fs)[None], "mean")
+            timings.append(time.perf_counter() - start)
+        print(f"{n_channels} channels, 1 s at {fs} Hz: {np.median(timings) * 1000:.2f} ms per prediction "
+              f"({1 / np.median(timings):,.0f} windows/s on one core)")
+
+
+if __name__ == "__main__":
+    main()
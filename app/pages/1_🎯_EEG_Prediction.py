@@ -1,16 +1,28 @@
 import os
 import sys
+import tempfile
+import time
 import numpy as np
 import pandas as pd
 import streamlit as st
 import matplotlib.pyplot as plt
-import joblib
 
 st.set_page_config(page_title="EEG Prediction", page_icon="🎯", layout="wide")
 
 # Import and apply theme
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from sky_blue_theme import DARK_MODE_CSS
+from eeg_inference import DATA_PATH, MODELS_DIR, EEG_FEATURES, score_batch
+from model_registry import DEFAULT_MODEL, get_registry
+from latency_stats import get_latency_store
+from bulk_scoring import CHUNK_ROWS, DEFAULT_WORKERS, score_csv
+from eeg_windows import iter_window_features, window_feature_frame
+from recordings import RECORDING_TYPES, iter_recording_chunks, list_recordings, recording_info, resolve_recording
+from multichannel import AGGREGATIONS, predict_band_powers
+from artifacts import ARTIFACT_CHECKS, DEFAULT_THRESHOLDS, rejection_counts
+from filter_bank import filter_bands
+from synthetic_eeg import synthesize_waves
+from band_power import BANDS, band_index, band_powers
 st.markdown(DARK_MODE_CSS, unsafe_allow_html=True)
 
 st.markdown("""
@@ -32,43 +44,117 @@ st.markdown("""
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 PROJECT_DIR = os.path.dirname(BASE_DIR)
-DATA_PATH = os.path.join(PROJECT_DIR, "data", "realistic_combined_eeg_10000_enhanced.csv")
-MODEL_PATH = os.path.join(PROJECT_DIR, "models", "final_eeg_model.joblib")
-SCALER_PATH = os.path.join(PROJECT_DIR, "models", "scaler.joblib")
 OUTPUTS_DIR = os.path.join(PROJECT_DIR, "outputs")
+# Server-side recordings offered by the Multi-Window tab; nothing outside this directory can be opened
+RECORDINGS_DIR = os.environ.get("EEG_RECORDINGS_DIR", os.path.join(PROJECT_DIR, "data", "recordings"))
+MODEL_COMPARISON_PATH = os.path.join(MODELS_DIR, "model_comparison.csv")
+
+# Names used in model_comparison.csv for the estimator types we can run
+REPORTED_NAMES = {
+    "RandomForestClassifier": "Random Forest",
+    "LogisticRegression": "Logistic Regression",
+    "GradientBoostingClassifier": "Gradient Boosting",
+    "MLPClassifier": "MLP Neural Network",
+}
+LATENCY_REPEATS = 30
+# Multi-window analysis: seconds of signal per chunk, auto-run limit and rows shown while streaming
+MW_CHUNK_SECONDS = 600
+MW_AUTO_RUN_SECONDS = 600
+MW_LIVE_ROWS = 50
+MW_DEFAULT_CHANNELS = 4
+BAND_COLORS = ["#A78BFA", "#60A5FA", "#10B981", "#F59E0B", "#EF4444"]
 
 @st.cache_data
 def load_data():
     return pd.read_csv(DATA_PATH)
 
+@st.cache_data
+def load_model_comparison():
+    return pd.read_csv(MODEL_COMPARISON_PATH) if os.path.exists(MODEL_COMPARISON_PATH) else None
+
+# Compiled model with its matching scaler folded in, shared through the model registry
+def load_model(model_name):
+    return get_registry().get(model_name)
+
+# Score the whole dataset once per process and model; picking a sample is then an array lookup
 @st.cache_resource
-def load_model_and_scaler():
-    return joblib.load(MODEL_PATH), joblib.load(SCALER_PATH)
+def score_dataset(model_name):
+    X = df[eeg_features].to_numpy()
+    # Resolve (load or convert) the model first so only scoring is timed
+    model = load_model(model_name)
+    start = time.perf_counter()
+    labels, proba = score_batch(model, None, X)
+    batch_seconds = time.perf_counter() - start
+    labels.setflags(write=False)
+    proba.setflags(write=False)
+    return labels, proba, batch_seconds
+
+# Waveforms of every sample in one matrix product, seeded so a sample always looks the same
+@st.cache_resource
+def dataset_waveforms():
+    t, waves = synthesize_waves(df, seed=0, dtype=np.float32)
+    waves.setflags(write=False)
+    return t, waves
+
+def row_latency(model_name, x_row, repeats=LATENCY_REPEATS):
+    """Median wall time of a single-row predict_proba call, in seconds.
+
+    A synthetic benchmark, so it is kept out of the shared latency store.
+    """
+    model = load_model(model_name)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_proba(x_row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
 
 df = load_data()
-model, scaler = load_model_and_scaler()
 
-eeg_features = ["delta", "theta", "alpha", "beta", "gamma", "delta_rel", "theta_rel", "alpha_rel", "beta_rel", "gamma_rel",
-                "alpha_beta_ratio", "theta_beta_ratio", "engagement_index", "fatigue", "workload", "calmness"]
+eeg_features = EEG_FEATURES
+eeg_models = [name for name, spec in get_registry().specs.items() if spec.features == eeg_features]
 
 st.markdown('<div class="page-header"><div class="page-title">🎯 EEG Prediction & Analysis</div></div>', unsafe_allow_html=True)
 
 # Sidebar
 with st.sidebar:
+    st.markdown("### 🤖 Model")
+    model_name = st.selectbox("Active model", eeg_models, index=eeg_models.index(DEFAULT_MODEL),
+                              help=get_registry().spec(DEFAULT_MODEL).description)
     st.markdown("### 🔧 Sample Selection")
     idx = st.number_input("Choose sample index", min_value=0, max_value=len(df)-1, value=0, step=1)
     st.markdown("---")
     st.caption(f"📊 Total: {len(df):,} | 📚 Study: {len(df[df['label']==1]):,} | 📱 Phone: {len(df[df['label']==0]):,}")
 
+pred_labels, pred_proba, _ = score_dataset(model_name)
+dataset_accuracy = float((pred_labels == df["label"].to_numpy()).mean())
+with st.sidebar:
+    st.caption(f"🎯 Dataset accuracy: {dataset_accuracy:.2%}")
+
 row = df.iloc[idx]
 true_label = int(row["label"])
 
-# Prediction
-X_row = row[eeg_features].values.reshape(1, -1)
-X_row_scaled = scaler.transform(X_row)
-pred_label = int(model.predict(X_row_scaled)[0])
-proba = model.predict_proba(X_row_scaled)[0] if hasattr(model, "predict_proba") else [0.5, 0.5]
-study_prob, phone_prob = float(proba[1]), float(proba[0])
+# The selected sample is scored on demand (one row, microseconds) and every
+# stage is timed into the shared latency store; dataset-wide figures come from
+# the cached batch scores
+latency_store = get_latency_store()
+x_row = row[eeg_features].to_numpy(dtype=np.float64).reshape(1, -1)
+row_labels, row_proba = score_batch(load_model(model_name), None, x_row, timer=latency_store.stage_timer(model_name))
+pred_label = int(row_labels[0])
+study_prob, phone_prob = float(row_proba[0, 1]), float(row_proba[0, 0])
+
+with st.sidebar:
+    if st.toggle("⏱️ Inference latency", value=False, help="Rolling per-stage latency across all sessions of this server"):
+        latency_rows = latency_store.summary()
+        if latency_rows:
+            st.dataframe(pd.DataFrame(latency_rows)[["model", "stage", "calls", "p50_us", "p95_us", "p99_us"]],
+                         use_container_width=True, hide_index=True)
+        st.caption(f"Last {latency_store.window:,} calls per model and stage, in µs. transform is the scaler "
+                   "(only input conversion where it is folded into the model's weights), predict picks the label "
+                   "from predict_proba")
+        st.download_button("📥 Export CSV", latency_store.to_csv(), file_name="inference_latency.csv", mime="text/csv")
+        if st.button("Reset latency stats"):
+            latency_store.reset()
 
 # Prediction Cards
 col1, col2, col3 = st.columns(3)
@@ -93,20 +179,20 @@ with col3:
     </div>''', unsafe_allow_html=True)
 
 # Tabs for different sections
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
     "📈 EEG Waveform", 
     "🌊 Segment Analysis", 
     "📊 Multi-Window Analysis", 
     "📋 EDA Visualizations", 
     "📁 Dataset", 
-    "🔢 Feature Values"
+    "🔢 Feature Values",
+    "⚖️ Model Comparison",
+    "📦 Bulk Scoring"
 ])
 
 with tab1:
-    t = np.linspace(0, 2, 512, endpoint=False)
-    wave = sum(row[f"{b}_rel"] * np.sin(2*np.pi*f*t) for b, f in [("delta",2),("theta",6),("alpha",10),("beta",20),("gamma",40)])
-    wave += 0.05 * np.random.randn(len(t))
-    wave /= (np.max(np.abs(wave)) + 1e-9)
+    t, waves = dataset_waveforms()
+    wave = waves[idx]
     
     fig, ax = plt.subplots(figsize=(12, 4))
     fig.patch.set_facecolor('#0E1117')
@@ -123,6 +209,24 @@ with tab1:
     ax.grid(True, alpha=0.2, color='#333')
     st.pyplot(fig)
     plt.close(fig)
+    
+    # Band decomposition: zero-phase band-pass filters applied to the waveform above
+    st.markdown("### 🎚️ Band Decomposition")
+    band_waves = filter_bands(wave, 1 / (t[1] - t[0]))
+    fig, axes = plt.subplots(len(BANDS), 1, figsize=(12, 7), sharex=True)
+    fig.patch.set_facecolor('#0E1117')
+    for ax, (band, (low, high)), band_wave, band_color in zip(axes, BANDS.items(), band_waves, BAND_COLORS):
+        ax.set_facecolor('#0E1117')
+        ax.plot(t, band_wave, color=band_color, linewidth=1.2)
+        ax.set_ylabel(f"{band}\n{low:g}-{high:g} Hz", color='#9CA3AF', fontsize=8)
+        ax.tick_params(colors='#9CA3AF', labelsize=7)
+        for spine in ['top','right']: ax.spines[spine].set_visible(False)
+        for spine in ['bottom','left']: ax.spines[spine].set_color('#333')
+        ax.grid(True, alpha=0.2, color='#333')
+    axes[-1].set_xlabel("Time (s)", color='#9CA3AF')
+    st.pyplot(fig)
+    plt.close(fig)
+    st.caption("Each band is the waveform passed through a 4th-order Butterworth band-pass filter forwards and backwards (zero phase).")
 
 # ==================== TAB 2: SEGMENT ANALYSIS ====================
 with tab2:
@@ -190,18 +294,12 @@ with tab2:
     def time_domain_features(window):
         return np.mean(window), np.var(window), np.sum(window ** 2)
     
-    def relative_alpha_power(window):
-        fft_vals = np.fft.fft(window)
-        freqs = np.fft.fftfreq(len(fft_vals), d=1/fs)
-        power = np.abs(fft_vals) ** 2
-        total_power = power.sum()
-        alpha_power = power[(freqs >= 8) & (freqs <= 13)].sum()
-        return alpha_power / total_power if total_power != 0 else 0
-    
     study_mean, study_var, study_energy = time_domain_features(study_window)
     play_mean, play_var, play_energy = time_domain_features(play_window)
-    study_alpha_rel = relative_alpha_power(study_window)
-    play_alpha_rel = relative_alpha_power(play_window)
+    # Relative power of all five bands for both windows in one kernel call
+    study_band_rel, play_band_rel = band_powers(np.stack([study_window, play_window]), fs, relative=True)
+    study_alpha_rel = study_band_rel[band_index("alpha")]
+    play_alpha_rel = play_band_rel[band_index("alpha")]
     
     # Results Table
     st.markdown("### 📊 Feature Comparison Table")
@@ -229,107 +327,218 @@ with tab2:
 
 # ==================== TAB 3: MULTI-WINDOW ANALYSIS ====================
 with tab3:
-    st.markdown('<div class="section-title">📊 Multi-Window Wave Analysis (10 Windows)</div>', unsafe_allow_html=True)
-    st.info("Temporal analysis across multiple 1-second windows to track variance and alpha power over time")
+    st.markdown('<div class="section-title">📊 Multi-Window Wave Analysis</div>', unsafe_allow_html=True)
+    st.info("Temporal analysis across sliding windows to track variance and alpha power over time. "
+            f"Signals are processed in {MW_CHUNK_SECONDS // 60}-minute chunks, so multi-hour recordings never have to fit in memory.")
     
     # Settings
-    fs_mw = 128
-    duration_mw = 10
-    t_mw = np.linspace(0, duration_mw, int(fs_mw * duration_mw), endpoint=False)
-    window_size_mw = fs_mw
-    step_size_mw = fs_mw
-    
-    # Generate waves
-    def generate_alpha_wave_mw(state="study"):
+    source_mw = st.radio("Signal source", ["🧪 Synthetic Study vs Play", "📂 Recording file"], horizontal=True)
+    synthetic_mw = source_mw.startswith("🧪")
+    mw1, mw2, mw3, mw4 = st.columns(4)
+    with mw1:
+        fs_mw = st.number_input("Sampling rate (Hz)", min_value=16, max_value=4096, value=128 if synthetic_mw else 256, step=16)
+    with mw2:
+        window_sec_mw = st.number_input("Window (s)", min_value=0.05, max_value=60.0, value=1.0, step=0.25)
+    with mw3:
+        hop_sec_mw = st.number_input("Hop (s)", min_value=0.01, max_value=60.0, value=1.0, step=0.25)
+    
+    # Generate waves chunk by chunk (any duration, bounded memory)
+    def synthetic_chunks_mw(n_samples, fs, chunk_samples):
         base_freq = 10
-        if state == "study":
-            noise = np.random.normal(0, 0.2, len(t_mw))
+        rng = np.random.default_rng()
+        for start in range(0, n_samples, chunk_samples):
+            t = np.arange(start, min(start + chunk_samples, n_samples)) / fs
+            wave = np.sin(2 * np.pi * base_freq * t)
+            yield np.stack([wave + rng.normal(0, 0.2, len(t)), wave + rng.normal(0, 0.6, len(t))])
+    
+    recording_mw = None
+    classify_mw = False
+    if synthetic_mw:
+        with mw4:
+            duration_mw = st.number_input("Duration (s)", min_value=2, max_value=8 * 3600, value=10, step=60)
+        n_samples_mw = int(fs_mw * duration_mw)
+        channel_names_mw = ["Study", "Play"]
+        run_mw = n_samples_mw <= fs_mw * MW_AUTO_RUN_SECONDS or st.button("▶️ Analyze", key="mw_run")
+    else:
+        server_recordings_mw = list_recordings(RECORDINGS_DIR)
+        server_mw = st.selectbox("Recording on the server", [""] + server_recordings_mw,
+                                 format_func=lambda name: name or "—",
+                                 help=f"Files under {RECORDINGS_DIR} (set EEG_RECORDINGS_DIR to change it): EDF/BDF, "
+                                      "(channels x samples) .npy, raw float32 .f32 or one column per channel .csv")
+        uploaded_mw = st.file_uploader("…or upload a recording", type=RECORDING_TYPES, key="mw_upload")
+        # Uploads live in a per-session temporary directory (removed with the session); only the current one is kept
+        if "mw_upload_dir" not in st.session_state:
+            st.session_state.mw_upload_dir = tempfile.TemporaryDirectory(prefix="eeg_mw_")
+        upload_dir_mw = st.session_state.mw_upload_dir.name
+        current_upload_mw = None
+        if uploaded_mw is not None:
+            current_upload_mw = f"{uploaded_mw.file_id}{os.path.splitext(uploaded_mw.name)[1].lower()}"
+        for name in os.listdir(upload_dir_mw):
+            if name != current_upload_mw:
+                os.remove(os.path.join(upload_dir_mw, name))
+        if current_upload_mw is not None:
+            recording_mw = os.path.join(upload_dir_mw, current_upload_mw)
+            if not os.path.exists(recording_mw):
+                with open(recording_mw, "wb") as f:
+                    f.write(uploaded_mw.getbuffer())
+        elif server_mw:
+            try:
+                recording_mw = resolve_recording(RECORDINGS_DIR, server_mw)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+        run_mw = False
+        info_mw = None
+        if recording_mw:
+            try:
+                info_mw = recording_info(recording_mw)
+            except (OSError, ValueError, KeyError) as e:
+                st.error(f"❌ Could not read {os.path.basename(recording_mw) if uploaded_mw is None else uploaded_mw.name}: {e}")
+        if info_mw is not None:
+            if info_mw["fs"]:
+                fs_mw = info_mw["fs"]
+            n_samples_mw = info_mw["n_samples"]
+            length_mw = f", {n_samples_mw / fs_mw / 3600:.2f} h" if n_samples_mw else ""
+            st.caption(f"📄 {len(info_mw['channels'])} channels{length_mw}"
+                       + (f", {fs_mw:g} Hz from the file header" if info_mw["fs"] else ""))
+            channel_names_mw = st.multiselect("Channels", info_mw["channels"], default=info_mw["channels"][:MW_DEFAULT_CHANNELS])
+            # EDF/BDF channels are selected by label, array and CSV columns by position
+            channel_sel_mw = (channel_names_mw if recording_mw.lower().endswith((".edf", ".bdf"))
+                              else [info_mw["channels"].index(name) for name in channel_names_mw])
+            cls1, cls2 = st.columns(2)
+            with cls1:
+                classify_mw = st.checkbox(f"🧠 Classify each window with {model_name}", value=True)
+            with cls2:
+                aggregation_mw = st.selectbox("Channel aggregation", AGGREGATIONS, disabled=not classify_mw,
+                                              help="How the selected channels are combined into the model's 16 features")
+            run_mw = bool(channel_names_mw) and st.button("▶️ Analyze", key="mw_run")
+    with st.expander("🧹 Artifact rejection"):
+        reject_mw = st.checkbox("Reject windows with blink, pop or muscle artifacts", value=not synthetic_mw,
+                                help="Rejected windows are left out of the averages, plots and predictions")
+        ar1, ar2, ar3 = st.columns(3)
+        with ar1:
+            amplitude_mw = st.number_input("Max peak-to-peak (µV)", min_value=1.0, value=DEFAULT_THRESHOLDS["amplitude"], disabled=not reject_mw)
+        with ar2:
+            gradient_mw = st.number_input("Max gradient (µV/ms)", min_value=0.1, value=DEFAULT_THRESHOLDS["gradient"], disabled=not reject_mw)
+        with ar3:
+            hf_ratio_mw = st.number_input(f"Max {DEFAULT_THRESHOLDS['hf_low']:g}-{DEFAULT_THRESHOLDS['hf_high']:g} Hz power share",
+                                          min_value=0.01, max_value=1.0, value=DEFAULT_THRESHOLDS["hf_ratio"], disabled=not reject_mw,
+                                          help=f"Share of the {DEFAULT_THRESHOLDS['ref_low']:g}-{DEFAULT_THRESHOLDS['hf_high']:g} Hz power "
+                                               "(muscle artifacts); notch-filter mains hum first")
+    thresholds_mw = {"amplitude": amplitude_mw, "gradient": gradient_mw, "hf_ratio": hf_ratio_mw} if reject_mw else None
+    window_size_mw = max(int(round(fs_mw * window_sec_mw)), 2)
+    step_size_mw = max(int(round(fs_mw * hop_sec_mw)), 1)
+    chunk_samples_mw = max(int(fs_mw * MW_CHUNK_SECONDS), window_size_mw)
+    
+    if run_mw:
+        chunks_mw = (synthetic_chunks_mw(n_samples_mw, fs_mw, chunk_samples_mw) if synthetic_mw
+                     else iter_recording_chunks(recording_mw, chunk_samples_mw, channel_sel_mw))
+        # Multi-window analysis: features arrive per chunk and are shown as they come in
+        progress_mw = st.progress(0.0, text="Analyzing...")
+        live_table_mw = st.empty()
+        frames_mw = []
+        predictions_mw = []
+        n_windows_mw = 0
+        rejected_counts_mw = dict.fromkeys(["windows", "rejected"] + ARTIFACT_CHECKS, 0)
+        classifier_mw = load_model(model_name) if classify_mw else None
+        for starts_mw, feats_mw in iter_window_features(chunks_mw, fs_mw, window_size_mw, step_size_mw, thresholds_mw):
+            frames_mw.append(window_feature_frame(starts_mw, feats_mw, fs_mw, channel_names_mw))
+            # A window is kept for prediction only when none of its channels is contaminated
+            keep_mw = np.ones(len(starts_mw), dtype=bool)
+            if thresholds_mw is not None:
+                for name, count in rejection_counts(feats_mw["artifacts"], channel_axis=0).items():
+                    rejected_counts_mw[name] += count
+                keep_mw = ~feats_mw["rejected"].any(axis=0)
+            if classifier_mw is not None and keep_mw.any():
+                # (channels, windows, 5) -> (windows, channels, 5), channels aggregated into one feature row per window
+                powers_mw = np.swapaxes(feats_mw["band_powers"], 0, 1)[keep_mw]
+                labels_mw, proba_mw = predict_band_powers(classifier_mw, powers_mw, aggregation_mw,
+                                                          timer=latency_store.stage_timer(model_name))
+                predictions_mw.append(pd.DataFrame({"start_s": starts_mw[keep_mw] / fs_mw, "prediction": np.where(labels_mw == 1, "Study", "Phone"),
+                                                    "study_prob": proba_mw[:, 1]}))
+            n_windows_mw += len(starts_mw)
+            done_s = (starts_mw[-1] + window_size_mw) / fs_mw
+            fraction = min((starts_mw[-1] + window_size_mw) / n_samples_mw, 1.0) if n_samples_mw else 0.0
+            progress_mw.progress(fraction, text=f"{n_windows_mw:,} windows, {done_s / 60:,.1f} min analyzed")
+            live_table_mw.dataframe(frames_mw[-1].tail(MW_LIVE_ROWS), use_container_width=True, hide_index=True)
+        live_table_mw.empty()
+        progress_mw.empty()
+        mw_df = pd.concat(frames_mw, ignore_index=True) if frames_mw else pd.DataFrame()
+    
+        if mw_df.empty:
+            st.warning("⚠️ Signal is shorter than one window")
         else:
-            noise = np.random.normal(0, 0.6, len(t_mw))
-        return np.sin(2 * np.pi * base_freq * t_mw) + noise
-    
-    alpha_study_mw = generate_alpha_wave_mw("study")
-    alpha_play_mw = generate_alpha_wave_mw("play")
-    
-    # Multi-window analysis
-    study_results = []
-    play_results = []
-    
-    for start in range(0, len(alpha_study_mw) - window_size_mw + 1, step_size_mw):
-        end = start + window_size_mw
-        s_window = alpha_study_mw[start:end]
-        p_window = alpha_play_mw[start:end]
-        
-        s_mean, s_var, s_energy = time_domain_features(s_window)
-        s_alpha = relative_alpha_power(s_window)
-        p_mean, p_var, p_energy = time_domain_features(p_window)
-        p_alpha = relative_alpha_power(p_window)
-        
-        study_results.append([s_mean, s_var, s_energy, s_alpha])
-        play_results.append([p_mean, p_var, p_energy, p_alpha])
-    
-    study_results = np.array(study_results)
-    play_results = np.array(play_results)
-    windows = np.arange(1, len(study_results) + 1)
-    
-    # Summary metrics
-    st.markdown("### 📈 Average Values Across All Windows")
-    col1, col2 = st.columns(2)
-    with col1:
-        st.markdown("**📚 Study (Focused)**")
-        st.metric("Variance Avg", f"{study_results[:,1].mean():.4f}")
-        st.metric("Energy Avg", f"{study_results[:,2].mean():.4f}")
-        st.metric("Rel Alpha Avg", f"{study_results[:,3].mean():.4f}")
-    with col2:
-        st.markdown("**📱 Play (Distracted)**")
-        st.metric("Variance Avg", f"{play_results[:,1].mean():.4f}")
-        st.metric("Energy Avg", f"{play_results[:,2].mean():.4f}")
-        st.metric("Rel Alpha Avg", f"{play_results[:,3].mean():.4f}")
-    
-    # Variance Plot
-    st.markdown("### 📉 Variance Across Windows")
-    fig, ax = plt.subplots(figsize=(12, 4))
-    fig.patch.set_facecolor('#0E1117')
-    ax.set_facecolor('#0E1117')
-    ax.plot(windows, study_results[:,1], label="Study Variance", marker='o', color='#10B981')
-    ax.plot(windows, play_results[:,1], label="Play Variance", marker='s', color='#EF4444')
-    ax.set_xlabel("Window Number", color='#9CA3AF')
-    ax.set_ylabel("Variance", color='#9CA3AF')
-    ax.set_title("Variance Across Windows", color='white', fontweight='bold')
-    ax.tick_params(colors='#9CA3AF')
-    ax.legend(facecolor='#1a1f2e', edgecolor='#333', labelcolor='white')
-    for spine in ax.spines.values(): spine.set_color('#333')
-    ax.grid(True, alpha=0.2, color='#333')
-    st.pyplot(fig)
-    plt.close(fig)
-    
-    # Alpha Power Plot
-    st.markdown("### 🧠 Relative Alpha Power Across Windows")
-    fig, ax = plt.subplots(figsize=(12, 4))
-    fig.patch.set_facecolor('#0E1117')
-    ax.set_facecolor('#0E1117')
-    ax.plot(windows, study_results[:,3], label="Study Relative Alpha", marker='o', color='#10B981')
-    ax.plot(windows, play_results[:,3], label="Play Relative Alpha", marker='s', color='#EF4444')
-    ax.set_xlabel("Window Number", color='#9CA3AF')
-    ax.set_ylabel("Relative Alpha Power", color='#9CA3AF')
-    ax.set_title("Relative Alpha Power Across Windows", color='white', fontweight='bold')
-    ax.tick_params(colors='#9CA3AF')
-    ax.legend(facecolor='#1a1f2e', edgecolor='#333', labelcolor='white')
-    for spine in ax.spines.values(): spine.set_color('#333')
-    ax.grid(True, alpha=0.2, color='#333')
-    st.pyplot(fig)
-    plt.close(fig)
-    
-    # Full Results Table
-    st.markdown("### 📋 Window-by-Window Results")
-    window_df = pd.DataFrame({
-        'Window': windows,
-        'Study Variance': [f"{v:.4f}" for v in study_results[:,1]],
-        'Play Variance': [f"{v:.4f}" for v in play_results[:,1]],
-        'Study Alpha Rel': [f"{v:.4f}" for v in study_results[:,3]],
-        'Play Alpha Rel': [f"{v:.4f}" for v in play_results[:,3]]
-    })
-    st.dataframe(window_df, use_container_width=True, hide_index=True)
+            st.caption(f"{n_windows_mw:,} windows of {window_size_mw} samples, hop {step_size_mw} samples, "
+                       f"{len(channel_names_mw)} channel(s)")
+            if thresholds_mw is not None:
+                st.caption(f"🧹 Rejected {rejected_counts_mw['rejected']:,} of {n_windows_mw:,} windows "
+                           f"({rejected_counts_mw['rejected'] / n_windows_mw:.1%}): "
+                           + ", ".join(f"{name} {rejected_counts_mw[name]:,}" for name in ARTIFACT_CHECKS))
+            clean_mw = mw_df[~mw_df["rejected"]] if "rejected" in mw_df else mw_df
+            if clean_mw.empty:
+                st.warning("⚠️ Every window was rejected as an artifact; check the signal units or loosen the thresholds")
+            by_channel = clean_mw.groupby("channel", sort=False)
+            channel_colors = {"Study": '#10B981', "Play": '#EF4444'}
+            channel_titles = {"Study": "📚 Study (Focused)", "Play": "📱 Play (Distracted)"}
+            markers = n_windows_mw <= 60
+            
+            # Summary metrics
+            st.markdown("### 📈 Average Values Across All Windows")
+            averages = by_channel[["variance", "energy", "alpha_rel"]].mean()
+            if 0 < len(averages) <= 4:
+                for col, (channel, avg) in zip(st.columns(len(averages)), averages.iterrows()):
+                    with col:
+                        st.markdown(f"**{channel_titles.get(channel, channel)}**")
+                        st.metric("Variance Avg", f"{avg['variance']:.4f}")
+                        st.metric("Energy Avg", f"{avg['energy']:.4f}")
+                        st.metric("Rel Alpha Avg", f"{avg['alpha_rel']:.4f}")
+            else:
+                st.dataframe(averages, use_container_width=True)
+            
+            for feature, ylabel, title in [("variance", "Variance", "📉 Variance Across Windows"),
+                                           ("alpha_rel", "Relative Alpha Power", "🧠 Relative Alpha Power Across Windows")]:
+                st.markdown(f"### {title}")
+                fig, ax = plt.subplots(figsize=(12, 4))
+                fig.patch.set_facecolor('#0E1117')
+                ax.set_facecolor('#0E1117')
+                for channel, group in by_channel:
+                    ax.plot(group["start_s"], group[feature], label=f"{channel} {ylabel}", color=channel_colors.get(channel),
+                            marker='o' if markers else None, linewidth=1.5 if markers else 0.8)
+                ax.set_xlabel("Window start (seconds)", color='#9CA3AF')
+                ax.set_ylabel(ylabel, color='#9CA3AF')
+                ax.set_title(title[2:], color='white', fontweight='bold')
+                ax.tick_params(colors='#9CA3AF')
+                if not clean_mw.empty:
+                    ax.legend(facecolor='#1a1f2e', edgecolor='#333', labelcolor='white')
+                for spine in ax.spines.values(): spine.set_color('#333')
+                ax.grid(True, alpha=0.2, color='#333')
+                st.pyplot(fig)
+                plt.close(fig)
+            
+            if predictions_mw:
+                pred_mw = pd.concat(predictions_mw, ignore_index=True)
+                st.markdown(f"### 🧠 Predicted State per Window ({model_name}, {aggregation_mw} of {len(channel_names_mw)} channels)")
+                pc1, pc2 = st.columns(2)
+                pc1.metric("📚 Study windows", f"{(pred_mw['prediction'] == 'Study').mean():.1%}")
+                pc2.metric("Mean Study probability", f"{pred_mw['study_prob'].mean():.1%}")
+                fig, ax = plt.subplots(figsize=(12, 3))
+                fig.patch.set_facecolor('#0E1117')
+                ax.set_facecolor('#0E1117')
+                ax.plot(pred_mw["start_s"], pred_mw["study_prob"], color='#10B981', linewidth=1.5 if markers else 0.8)
+                ax.axhline(0.5, color='#9CA3AF', linestyle='--', linewidth=0.8)
+                ax.set_ylim(0, 1)
+                ax.set_xlabel("Window start (seconds)", color='#9CA3AF')
+                ax.set_ylabel("Study probability", color='#9CA3AF')
+                ax.tick_params(colors='#9CA3AF')
+                for spine in ax.spines.values(): spine.set_color('#333')
+                ax.grid(True, alpha=0.2, color='#333')
+                st.pyplot(fig)
+                plt.close(fig)
+                st.caption("The classifier was trained on the dataset's band-power scale; recordings in other units shift the absolute band features.")
+            
+            # Full Results Table
+            st.markdown("### 📋 Window-by-Window Results")
+            st.dataframe(mw_df, use_container_width=True, hide_index=True)
+            st.download_button("📥 Download window features", mw_df.to_csv(index=False), file_name="window_features.csv", mime="text/csv")
 
 with tab4:
     st.markdown('<div class="section-title">📊 EDA Visualizations (from EDA.py)</div>', unsafe_allow_html=True)
@@ -384,7 +593,7 @@ with tab4:
 
 with tab5:
     st.markdown('<div class="section-title">📋 EEG Dataset Access</div>', unsafe_allow_html=True)
-    st.markdown(f"**File:** `realistic_combined_eeg_10000_enhanced.csv`")
+    st.markdown(f"**File:** `{os.path.basename(DATA_PATH)}`")
     st.markdown(f"**Rows:** {len(df):,} | **Columns:** {len(df.columns)}")
     
     # Data preview
@@ -412,3 +621,85 @@ with tab6:
         st.markdown("**Derived Metrics**")
         st.dataframe(pd.DataFrame({f: [f"{row[f]:.4f}"] for f in ["engagement_index","fatigue","workload","calmness"]}).T.rename(columns={0:"Value"}))
 
+# ==================== TAB 7: MODEL COMPARISON ====================
+with tab7:
+    st.markdown('<div class="section-title">⚖️ Model Comparison (Cost per Prediction)</div>', unsafe_allow_html=True)
+    st.info(f"Each model scores sample #{idx} {LATENCY_REPEATS} times (median latency) and the full dataset in one batch")
+
+    # Only the models picked here are loaded; types come from the registry specs
+    compare = st.multiselect("Models to compare", eeg_models, default=[model_name])
+    reported = load_model_comparison()
+    y_true = df["label"].to_numpy()
+
+    comparison_rows = []
+    for name in compare:
+        m = load_model(name)
+        model_type = get_registry().spec(name).model_type
+        labels_m, proba_m, batch_seconds = score_dataset(name)
+        # The sample itself goes through the timed path like a click; the repeats below are a benchmark
+        row_label_m, row_proba_m = score_batch(m, None, x_row, timer=latency_store.stage_timer(name))
+        reported_name = REPORTED_NAMES.get(model_type)
+        reported_acc = None
+        if reported is not None and reported_name in set(reported["Model"]):
+            reported_acc = float(reported.loc[reported["Model"] == reported_name, "Accuracy"].iloc[0])
+        comparison_rows.append({
+            "Model": name,
+            "Type": model_type,
+            "Prediction": "Study" if row_label_m[0] == 1 else "Phone",
+            "Study Prob": f"{row_proba_m[0, 1]:.1%}",
+            "Row Latency (µs)": round(row_latency(name, x_row) * 1e6, 1),
+            "Batch Throughput (rows/s)": round(len(df) / batch_seconds),
+            "Batch Cost (µs/row)": round(batch_seconds / len(df) * 1e6, 2),
+            "Accuracy (full dataset)": f"{(labels_m == y_true).mean():.2%}",
+            "Reported Accuracy": "—" if reported_acc is None else f"{reported_acc:.2%}",
+        })
+
+    if comparison_rows:
+        st.dataframe(pd.DataFrame(comparison_rows), use_container_width=True, hide_index=True)
+    if reported is not None:
+        runnable = {REPORTED_NAMES.get(get_registry().spec(name).model_type) for name in eeg_models
+                    if get_registry().available(name)}
+        missing = [name for name in reported["Model"] if name not in runnable]
+        if missing:
+            st.caption(f"No saved model in models/ for: {', '.join(missing)} — their accuracy is only available from model_comparison.csv")
+
+# ==================== TAB 8: BULK SCORING ====================
+with tab8:
+    st.markdown('<div class="section-title">📦 Bulk Scoring</div>', unsafe_allow_html=True)
+    st.info(f"Upload a CSV with the 16 feature columns; it is scored in chunks with **{model_name}** and written to disk as it goes. "
+            "For files larger than the upload limit run `python app/bulk_scoring.py input.csv output.csv`.")
+
+    uploaded = st.file_uploader("EEG feature CSV", type=["csv"])
+    b1, b2, b3 = st.columns(3)
+    with b1:
+        bulk_chunk_rows = st.number_input("Rows per chunk", min_value=1_000, max_value=1_000_000, value=CHUNK_ROWS, step=10_000)
+    with b2:
+        bulk_workers = st.number_input("Worker processes", min_value=0, max_value=os.cpu_count() or 1,
+                                       value=DEFAULT_WORKERS, help="0 scores in the app process")
+    with b3:
+        bulk_keep = st.checkbox("Keep input columns", value=False)
+
+    if uploaded is not None and st.button("🚀 Score file", type="primary"):
+        out_fd, out_path = tempfile.mkstemp(prefix="eeg_predictions_", suffix=".csv")
+        os.close(out_fd)
+        bar = st.progress(0.0, text="Scoring...")
+
+        def show_progress(rows_done, fraction):
+            bar.progress(fraction if fraction is not None else 0.0, text=f"{rows_done:,} rows scored")
+
+        try:
+            bulk_rows, bulk_seconds = score_csv(uploaded, out_path, model_name, int(bulk_chunk_rows), int(bulk_workers),
+                                                bulk_keep, show_progress)
+        except ValueError as e:
+            bar.empty()
+            st.error(f"❌ {e}")
+        else:
+            bar.progress(1.0, text=f"{bulk_rows:,} rows scored")
+            st.success(f"✅ {bulk_rows:,} rows in {bulk_seconds:.1f} s ({bulk_rows / max(bulk_seconds, 1e-9):,.0f} rows/s)")
+            st.dataframe(pd.read_csv(out_path, nrows=20), use_container_width=True)
+            with open(out_path, "rb") as f:
+                # The button keeps its own copy of the data, so the file can go right away
+                st.download_button("📥 Download predictions", f, file_name=f"{os.path.splitext(uploaded.name)[0]}_predictions.csv",
+                                   mime="text/csv")
+        finally:
+            os.remove(out_path)
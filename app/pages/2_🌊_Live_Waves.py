@@ -1,11 +1,8 @@
 import os
 import sys
-import numpy as np
+import time
 import pandas as pd
 import streamlit as st
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import time
 
 # ================= PAGE CONFIG =================
 st.set_page_config(
@@ -17,6 +14,12 @@ st.set_page_config(
 # Import and apply theme with session state
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from sky_blue_theme import DARK_MODE_CSS
+from eeg_inference import DATA_PATH
+from band_power import BANDS
+from synthetic_eeg import SyntheticSource
+from live_stream import DEFAULT_IDLE_TIMEOUT, LiveStream, SampleProducer
+from stream_ingest import DEFAULT_PORT, POLICIES, StreamReceiver
+from live_chart import live_wave_chart
 st.markdown(DARK_MODE_CSS, unsafe_allow_html=True)
 
 # ================= ADDITIONAL CSS =================
@@ -74,10 +77,28 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ================= PATHS =================
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-PROJECT_DIR = os.path.dirname(BASE_DIR)
-DATA_PATH = os.path.join(PROJECT_DIR, "data", "realistic_combined_eeg_10000_enhanced.csv")
+# ================= SETTINGS =================
+LIVE_FS = 256
+# Noise added to the study and phone waves (the distracted wave is more erratic)
+LIVE_NOISE = [0.05, 0.15]
+# Samples are produced in the background at LIVE_FS; the chart redraws at most this often
+LIVE_FRAME_SECONDS = 0.1
+# Seconds of signal kept in the shared buffer and shown in the chart (selectable in the control panel)
+BUFFER_SECONDS_OPTIONS = [2, 5, 10, 30, 60]
+DEFAULT_BUFFER_SECONDS = 2
+# Band ratios are tracked over the last second of both waves
+BAND_WINDOW = LIVE_FS
+# Waveform shown in the chart: the raw signal or one filtered band (index into BANDS)
+WAVE_PANELS = [("📚 FOCUSED BRAIN (Study / Reading)", "#10B981", "rgba(16, 185, 129, 0.1)"),
+               ("📱 DISTRACTED BRAIN (Phone / Scrolling)", "#EF4444", "rgba(239, 68, 68, 0.1)")]
+# A socket source shows the first two channels of whatever device (or replay_sender.py) is sending
+SOCKET_PANELS = [("📡 CHANNEL 1", "#10B981", "rgba(16, 185, 129, 0.1)"),
+                 ("📡 CHANNEL 2", "#EF4444", "rgba(239, 68, 68, 0.1)")]
+LIVE_SOURCES = {"Synthetic": None, "Socket (TCP)": "tcp", "Socket (UDP)": "udp"}
+# Chart range of the synthetic waves; socket data is drawn at ± the range chosen on the page (µV)
+SYNTHETIC_Y_RANGE = (-1.5, 1.5)
+DEFAULT_SOCKET_RANGE = 100.0
+WAVE_VIEWS = {"Raw": None, **{f"{band.capitalize()} ({low:g}-{high:g} Hz)": i for i, (band, (low, high)) in enumerate(BANDS.items())}}
 
 # ================= LOAD DATA =================
 @st.cache_data
@@ -94,39 +115,6 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# ================= INITIALIZE SESSION STATE =================
-if 'study_live_wave' not in st.session_state:
-    study_row = df[df["label"] == 1].iloc[0]
-    phone_row = df[df["label"] == 0].iloc[0]
-    
-    fs = 256
-    seconds = 2
-    t = np.linspace(0, seconds, int(seconds * fs), endpoint=False)
-    
-    study_wave = (
-        study_row["delta_rel"] * np.sin(2*np.pi*2*t) +
-        study_row["theta_rel"] * np.sin(2*np.pi*6*t) +
-        study_row["alpha_rel"] * np.sin(2*np.pi*10*t) +
-        study_row["beta_rel"]  * np.sin(2*np.pi*20*t) +
-        study_row["gamma_rel"] * np.sin(2*np.pi*40*t)
-    )
-    study_wave += 0.05 * np.random.randn(len(t))
-    study_wave /= (np.max(np.abs(study_wave)) + 1e-9)
-    
-    phone_wave = (
-        phone_row["delta_rel"] * np.sin(2*np.pi*2*t) +
-        phone_row["theta_rel"] * np.sin(2*np.pi*6*t) +
-        phone_row["alpha_rel"] * np.sin(2*np.pi*10*t) +
-        phone_row["beta_rel"]  * np.sin(2*np.pi*20*t) +
-        phone_row["gamma_rel"] * np.sin(2*np.pi*40*t)
-    )
-    phone_wave += 0.05 * np.random.randn(len(t))
-    phone_wave /= (np.max(np.abs(phone_wave)) + 1e-9)
-    
-    st.session_state.study_live_wave = study_wave.copy()
-    st.session_state.phone_live_wave = phone_wave.copy()
-    st.session_state.t_live = t
-
 # ================= CONTROL PANEL =================
 st.markdown('<div class="control-panel">', unsafe_allow_html=True)
 col1, col2, col3, col4 = st.columns([1, 1, 1, 2])
@@ -135,35 +123,11 @@ with col1:
     live_mode = st.toggle("🔴 Live Animation", value=False)
 
 with col2:
-    if st.button("🔄 Reset Waves"):
-        study_row = df[df["label"] == 1].iloc[0]
-        phone_row = df[df["label"] == 0].iloc[0]
-        t = st.session_state.t_live
-        
-        study_wave = (
-            study_row["delta_rel"] * np.sin(2*np.pi*2*t) +
-            study_row["theta_rel"] * np.sin(2*np.pi*6*t) +
-            study_row["alpha_rel"] * np.sin(2*np.pi*10*t) +
-            study_row["beta_rel"]  * np.sin(2*np.pi*20*t) +
-            study_row["gamma_rel"] * np.sin(2*np.pi*40*t)
-        )
-        study_wave += 0.05 * np.random.randn(len(t))
-        study_wave /= (np.max(np.abs(study_wave)) + 1e-9)
-        
-        phone_wave = (
-            phone_row["delta_rel"] * np.sin(2*np.pi*2*t) +
-            phone_row["theta_rel"] * np.sin(2*np.pi*6*t) +
-            phone_row["alpha_rel"] * np.sin(2*np.pi*10*t) +
-            phone_row["beta_rel"]  * np.sin(2*np.pi*20*t) +
-            phone_row["gamma_rel"] * np.sin(2*np.pi*40*t)
-        )
-        phone_wave += 0.05 * np.random.randn(len(t))
-        phone_wave /= (np.max(np.abs(phone_wave)) + 1e-9)
-        
-        st.session_state.study_live_wave = study_wave.copy()
-        st.session_state.phone_live_wave = phone_wave.copy()
+    reset_clicked = st.button("🔄 Reset Waves")
 
 with col3:
+    buffer_seconds = st.select_slider("Buffer (s)", BUFFER_SECONDS_OPTIONS, value=DEFAULT_BUFFER_SECONDS,
+                                      help="Seconds of signal the background producer keeps and the chart shows")
     if live_mode:
         st.markdown('<div class="status-indicator status-live">🔴 LIVE</div>', unsafe_allow_html=True)
     else:
@@ -185,66 +149,119 @@ with col4:
 
 st.markdown('</div>', unsafe_allow_html=True)
 
-# ================= UPDATE WAVES =================
-if live_mode:
-    for _ in range(3):
-        st.session_state.study_live_wave = np.roll(st.session_state.study_live_wave, -1)
-        st.session_state.phone_live_wave = np.roll(st.session_state.phone_live_wave, -1)
-        st.session_state.study_live_wave[-1] = st.session_state.study_live_wave[-2] + np.random.normal(0, 0.01)
-        st.session_state.phone_live_wave[-1] = st.session_state.phone_live_wave[-2] + np.random.normal(0, 0.03)
+view = st.radio("Waveform", list(WAVE_VIEWS), horizontal=True, help="Bands are the live signal passed through causal Butterworth band-pass filters")
 
-# ================= PLOT WAVES =================
-fig = make_subplots(
-    rows=2, cols=1,
-    subplot_titles=("📚 FOCUSED BRAIN (Study / Reading)", "📱 DISTRACTED BRAIN (Phone / Scrolling)"),
-    vertical_spacing=0.12
-)
+src1, src2, src3, src4 = st.columns(4)
+with src1:
+    source_name = st.selectbox("Source", list(LIVE_SOURCES),
+                               help="Socket sources listen on localhost for framed float32 chunks, "
+                                    "e.g. from `python app/replay_sender.py recording.edf`")
+protocol = LIVE_SOURCES[source_name]
+port, policy, y_range = None, None, SYNTHETIC_Y_RANGE
+if protocol is not None:
+    with src2:
+        port = int(st.number_input("Port", 1024, 65535, DEFAULT_PORT))
+    with src3:
+        policy = st.selectbox("When the page falls behind", POLICIES,
+                              help="drop-oldest discards the oldest waiting frame; block stops reading, "
+                                   "which makes a TCP sender wait")
+    with src4:
+        socket_range = st.number_input("Chart range (±)", 0.1, 10000.0, DEFAULT_SOCKET_RANGE)
+        y_range = (-socket_range, socket_range)
 
-# Study wave
-fig.add_trace(
-    go.Scatter(
-        x=st.session_state.t_live,
-        y=st.session_state.study_live_wave,
-        mode='lines',
-        name='Study',
-        line=dict(color='#10B981', width=2),
-        fill='tozeroy',
-        fillcolor='rgba(16, 185, 129, 0.1)'
-    ),
-    row=1, col=1
-)
+# ================= LIVE STREAM =================
+def reset_waves(config):
+    """Start a fresh stream: synthetic study / phone waves (pre-filled with one window) or a socket receiver."""
+    buffer_seconds, protocol, port, policy = config
+    if "producer" in st.session_state:
+        st.session_state.producer.stop()
+    stream = LiveStream(LIVE_FS, n_channels=2, capacity=buffer_seconds * LIVE_FS, band_window=BAND_WINDOW)
+    if protocol is None:
+        study_row = df[df["label"] == 1].iloc[0]
+        phone_row = df[df["label"] == 0].iloc[0]
+        source = SyntheticSource(pd.DataFrame([study_row, phone_row]), LIVE_FS, noise=LIVE_NOISE)
+        stream.write(source(buffer_seconds * LIVE_FS))
+        st.session_state.producer = SampleProducer(stream, source)
+    else:
+        st.session_state.producer = StreamReceiver(stream, port=port, protocol=protocol, policy=policy,
+                                                   idle_timeout=DEFAULT_IDLE_TIMEOUT)
+    st.session_state.live_stream = stream
+    st.session_state.live_config = config
+    st.session_state.live_chart_sent = None
 
-# Phone wave
-fig.add_trace(
-    go.Scatter(
-        x=st.session_state.t_live,
-        y=st.session_state.phone_live_wave,
-        mode='lines',
-        name='Phone',
-        line=dict(color='#EF4444', width=2),
-        fill='tozeroy',
-        fillcolor='rgba(239, 68, 68, 0.1)'
-    ),
-    row=2, col=1
-)
+live_config = (buffer_seconds, protocol, port, policy)
+if reset_clicked or st.session_state.get("live_config") != live_config:
+    reset_waves(live_config)
+if not live_mode:
+    st.session_state.producer.stop()
 
-# Update layout
-fig.update_layout(
-    height=400,
-    showlegend=False,
-    paper_bgcolor='#0E1117',
-    plot_bgcolor='#0E1117',
-    font=dict(color='#9CA3AF'),
-    margin=dict(t=60, b=50, l=60, r=40)
-)
+# ================= LIVE PANEL =================
+def show_band_ratios(stream, labels):
+    with stream.lock:
+        alpha_beta = stream.tracker.ratio("alpha", "beta")
+        theta_beta = stream.tracker.ratio("theta", "beta")
+        rel_alpha = stream.tracker.relative_band_powers()[:, list(BANDS).index("alpha")]
+    m1, m2, m3, m4, m5, m6 = st.columns(6)
+    m1.metric(f"{labels[0]} α/β", f"{alpha_beta[0]:.2f}")
+    m2.metric(f"{labels[0]} θ/β", f"{theta_beta[0]:.2f}")
+    m3.metric(f"{labels[0]} Rel α", f"{rel_alpha[0]:.1%}")
+    m4.metric(f"{labels[1]} α/β", f"{alpha_beta[1]:.2f}")
+    m5.metric(f"{labels[1]} θ/β", f"{theta_beta[1]:.2f}")
+    m6.metric(f"{labels[1]} Rel α", f"{rel_alpha[1]:.1%}")
 
-fig.update_yaxes(range=[-1.5, 1.5], gridcolor='rgba(255,255,255,0.1)', zerolinecolor='rgba(255,255,255,0.2)')
-fig.update_xaxes(gridcolor='rgba(255,255,255,0.1)')
-fig.update_xaxes(title_text="Time (seconds)", row=2, col=1)
-fig.update_yaxes(title_text="Amplitude", row=1, col=1)
-fig.update_yaxes(title_text="Amplitude", row=2, col=1)
+def show_receiver_stats(receiver):
+    stats = receiver.stats()
+    if receiver.error is not None:
+        st.error(f"Socket receiver stopped: {receiver.error}")
+    elif stats["sender_fs"] is not None and abs(stats["sender_fs"] - LIVE_FS) > 0.5:
+        st.warning(f"The sender streams at {stats['sender_fs']:g} Hz but this page expects {LIVE_FS} Hz; "
+                   "time axis and band powers will be off")
+    state = "connected" if stats["connected"] or protocol == "udp" and stats["rate"] else "waiting for a sender"
+    st.caption(f"📡 {protocol.upper()} :{port} {state} · received {stats['rate']:.0f} samples/s · "
+               f"{stats['frames']:,} frames · dropped {stats['dropped']:,} · lost {stats['lost']:,} · "
+               f"rejected {stats['rejected']:,} · {stats['pending']} waiting")
 
-st.plotly_chart(fig, use_container_width=True)
+# Only this fragment reruns on the live timer; the header, controls and
+# explanation below are rendered once per full run of the page. Samples keep
+# arriving from the producer thread at LIVE_FS whatever the frame rate, and
+# each frame sends the chart only the samples added since the previous one
+# (the whole window on a full run, or when the browser asks for it).
+@st.fragment(run_every=LIVE_FRAME_SECONDS if live_mode else None)
+def live_panel():
+    stream = st.session_state.live_stream
+    if live_mode:
+        # start() is a no-op while running and restarts a producer that stopped on idle
+        try:
+            st.session_state.producer.start().touch()
+        except OSError as e:
+            st.error(f"Could not listen on port {port}: {e}")
+    show_band_ratios(stream, ["📚", "📱"] if protocol is None else ["Ch 1", "Ch 2"])
+    if protocol is not None:
+        show_receiver_stats(st.session_state.producer)
+    
+    now = time.monotonic()
+    last_frame = st.session_state.get("live_last_frame")
+    if live_mode and last_frame is not None:
+        # Smoothed frame rate actually reached by this client
+        fps = 1 / max(now - last_frame, 1e-3)
+        st.session_state.live_fps = 0.8 * st.session_state.get("live_fps", fps) + 0.2 * fps
+    st.session_state.live_last_frame = now if live_mode else None
+    rate = f", chart at {st.session_state.live_fps:.0f} fps" if live_mode and "live_fps" in st.session_state else ""
+    origin = f"signal produced at {LIVE_FS} Hz" if protocol is None else "socket frames written as they arrive"
+    st.caption(f"Sliding DFT over the last {BAND_WINDOW / LIVE_FS:.0f} s · {origin} in the background{rate} · "
+               f"{stream.total / LIVE_FS:,.1f} s streamed, {buffer_seconds} s buffered")
+    
+    seen = None if st.session_state.live_chart_full else st.session_state.live_chart_sent
+    waves, total, full = stream.read_since(seen, buffer_seconds * LIVE_FS, WAVE_VIEWS[view])
+    panels = WAVE_PANELS if protocol is None else SOCKET_PANELS
+    resync = live_wave_chart(waves, total, LIVE_FS, buffer_seconds, panels, full=full, y_range=y_range)
+    st.session_state.live_chart_sent = total
+    st.session_state.live_chart_full = resync
+    if resync:
+        st.rerun(scope="fragment")
+
+st.session_state.live_chart_full = True
+live_panel()
 
 # ================= EXPLANATION =================
 st.markdown("---")
@@ -270,8 +287,3 @@ with col2:
     - Increased noise in signals
     - Associated with scattered attention
     """)
-
-# Auto-refresh
-if live_mode:
-    time.sleep(0.1)
-    st.rerun()
@@ -2,7 +2,6 @@ import os
 import sys
 import pandas as pd
 import streamlit as st
-import joblib
 import plotly.express as px
 import plotly.graph_objects as go
 
@@ -11,6 +10,7 @@ st.set_page_config(page_title="Model Insights", page_icon="🤖", layout="wide")
 # Import and apply theme
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from sky_blue_theme import DARK_MODE_CSS
+from model_registry import DEFAULT_MODEL, get_registry
 st.markdown(DARK_MODE_CSS, unsafe_allow_html=True)
 
 st.markdown("""
@@ -44,9 +44,8 @@ OUTPUTS_DIR = os.path.join(PROJECT_DIR, "outputs")
 eeg_features = ["delta", "theta", "alpha", "beta", "gamma", "delta_rel", "theta_rel", "alpha_rel", "beta_rel", "gamma_rel",
                 "alpha_beta_ratio", "theta_beta_ratio", "engagement_index", "fatigue", "workload", "calmness"]
 
-@st.cache_resource
 def load_model():
-    return joblib.load(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
+    return get_registry().get(DEFAULT_MODEL) if os.path.exists(MODEL_PATH) else None
 
 @st.cache_data
 def load_model_comparison():
@@ -223,8 +222,8 @@ else:
 # ================= FEATURE IMPORTANCE =================
 st.markdown('<div class="section-title">📊 Feature Importance</div>', unsafe_allow_html=True)
 
-if model and hasattr(model, 'feature_importances_'):
-    imp = pd.DataFrame({'Feature': eeg_features, 'Importance': model.feature_importances_}).sort_values('Importance', ascending=True)
+if model and 'feature_importances' in model.info:
+    imp = pd.DataFrame({'Feature': eeg_features, 'Importance': model.info['feature_importances']}).sort_values('Importance', ascending=True)
     fig = px.bar(imp, x='Importance', y='Feature', orientation='h', template='plotly_dark')
     fig.update_traces(marker_color='#7C3AED')
     fig.update_layout(paper_bgcolor='#0E1117', plot_bgcolor='#0E1117', height=320)
@@ -265,11 +264,19 @@ st.markdown('<div class="section-title">ℹ️ Model Information</div>', unsafe_
 if model:
     c1, c2, c3 = st.columns(3)
     with c1:
-        st.metric("Model Type", type(model).__name__)
+        st.metric("Model Type", model.info['model_type'])
     with c2:
         st.metric("Features", len(eeg_features))
     with c3:
-        if hasattr(model, 'n_estimators'):
-            st.metric("Estimators", model.n_estimators)
+        if 'n_estimators' in model.info:
+            st.metric("Estimators", model.info['n_estimators'])
         else:
             st.metric("Estimators", "N/A")
+
+# ================= MODEL REGISTRY =================
+st.markdown('<div class="section-title">📦 Model Registry</div>', unsafe_allow_html=True)
+
+registry = get_registry()
+st.caption(f"Resident: {registry.resident_bytes() / 1024:.0f} KB of {registry.budget_bytes / 1024 / 1024:.0f} MB budget · "
+           "models load on first use and the least recently used are evicted over budget")
+st.dataframe(pd.DataFrame(registry.stats()), use_container_width=True, hide_index=True)
@@ -0,0 +1,103 @@
+# Chunked readers for raw EEG recordings stored on disk
+#
+#   for chunk in iter_recording_chunks("night.npy", chunk_samples=256 * 600):
+#       ...   # (channels, m) float64 arrays, in order
+#
+# Supported formats:
+#   .npy         (channels x samples) or 1-D, memory-mapped
+#   .f32 / .raw  headerless little-endian float32, one channel, memory-mapped
+#   .edf / .bdf  EDF, EDF+ and BDF via edf_reader, memory-mapped
+#   .csv         one numeric column per channel, read with pandas chunksize
+#
+# Only one chunk is ever materialized, so recordings much larger than RAM can
+# be streamed through the window and band-power code.
+import os
+
+import numpy as np
+
+DEFAULT_CHUNK_SAMPLES = 1 << 18
+RECORDING_TYPES = ["npy", "f32", "raw", "edf", "bdf", "csv"]
+
+
+def open_recording(path, channels=None):
+    """Lazy (channels x samples) array for path, or None for CSV files.
+
+    channels (labels) restricts EDF/BDF files; other formats are row-selected
+    per chunk by the readers below so the memory map is never copied whole.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".edf", ".bdf"):
+        from edf_reader import EDFFile
+
+        return EDFFile(path, channels)
+    if ext == ".npy":
+        data = np.load(path, mmap_mode="r")
+        data = data.reshape(1, -1) if data.ndim == 1 else data
+    elif ext in (".f32", ".raw"):
+        data = np.memmap(path, dtype="<f4", mode="r").reshape(1, -1)
+    else:
+        return None
+    return data
+
+
+def recording_info(path):
+    """Channel names, sampling rate (None unless stored in the file) and length of a recording.
+
+    The length is None for CSV files, which would need a full read to count.
+    """
+    data = open_recording(path)
+    if data is None:
+        import pandas as pd
+
+        columns = pd.read_csv(path, nrows=1).select_dtypes("number").columns
+        return {"channels": list(columns), "fs": None, "n_samples": None}
+    return {
+        "channels": list(getattr(data, "labels", [f"ch{i}" for i in range(data.shape[0])])),
+        "fs": getattr(data, "fs", None),
+        "n_samples": data.shape[1],
+    }
+
+
+def iter_recording_chunks(path, chunk_samples=DEFAULT_CHUNK_SAMPLES, channels=None):
+    """Yield (channels, m) float64 chunks of a recording, m <= chunk_samples."""
+    data = open_recording(path, channels)
+    if data is not None:
+        rows = slice(None) if channels is None or hasattr(data, "labels") else list(channels)
+        for start in range(0, data.shape[1], chunk_samples):
+            yield np.asarray(data[:, start:start + chunk_samples][rows], dtype=np.float64)
+        return
+
+    import pandas as pd
+
+    for frame in pd.read_csv(path, chunksize=chunk_samples):
+        values = frame.select_dtypes("number")
+        if channels is not None:
+            values = values.iloc[:, list(channels)] if all(isinstance(c, int) for c in channels) else values[list(channels)]
+        yield values.to_numpy(dtype=np.float64).T
+
+
+def list_recordings(directory):
+    """Paths (relative to directory) of every readable recording under it; empty if it does not exist."""
+    found = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if os.path.splitext(name)[1].lower().lstrip(".") in RECORDING_TYPES:
+                found.append(os.path.relpath(os.path.join(root, name), directory))
+    return sorted(found)
+
+
+def resolve_recording(directory, name):
+    """Absolute path of `name` inside directory; ValueError if it resolves (e.g. via .. or a symlink) outside it."""
+    root = os.path.realpath(directory)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"{name} is outside the recordings directory")
+    return path
+
+
+def load_recording(path, channels=None):
+    """Whole (channels x samples) recording; memory-mapped where the format allows."""
+    data = open_recording(path, channels)
+    if data is not None:
+        return data if channels is None or hasattr(data, "labels") else data[list(channels)]
+    return np.concatenate(list(iter_recording_chunks(path, channels=channels)), axis=1)
@@ -0,0 +1,112 @@
+# Replay a recording from disk as a live socket stream (no hardware needed)
+#
+# Usage:
+#   python app/replay_sender.py night.edf --port 16571
+#   python app/replay_sender.py session.npy --fs 256 --protocol udp --channels 0 3 --loop
+#
+# Reads the recording chunk by chunk with recordings.iter_recording_chunks and
+# sends it in stream_ingest frames at the recording's sampling rate (or
+# --speed times faster), paced by the wall clock. Point Live Waves at the same
+# port with the "Socket" source to watch it. Over TCP the sender waits for the
+# receiver to start listening and reconnects if the connection drops.
+import argparse
+import socket
+import time
+
+from recordings import iter_recording_chunks, recording_info
+from stream_ingest import DEFAULT_PORT, MAX_UDP_VALUES, PROTOCOLS, encode_frame
+
+DEFAULT_FS = 256
+DEFAULT_FRAME_SAMPLES = 16
+READ_SECONDS = 10
+RETRY_SECONDS = 1.0
+
+
+def _connect(host, port, protocol):
+    kind = socket.SOCK_STREAM if protocol == "tcp" else socket.SOCK_DGRAM
+    while True:
+        sock = socket.socket(socket.AF_INET, kind)
+        try:
+            sock.connect((host, port))
+            return sock
+        except ConnectionRefusedError:
+            sock.close()
+            print(f"Waiting for a receiver on {host}:{port}...")
+            time.sleep(RETRY_SECONDS)
+
+
+def replay_recording(path, host="127.0.0.1", port=DEFAULT_PORT, protocol="tcp", fs=None,
+                     frame_samples=DEFAULT_FRAME_SAMPLES, channels=None, speed=1.0, loop=False, scale=1.0):
+    """Stream a recording to host:port in real time; returns the number of frames sent.
+
+    fs defaults to the rate stored in the recording (EDF/BDF), else DEFAULT_FS.
+    speed <= 0 sends as fast as possible.
+    """
+    info = recording_info(path)
+    fs = fs or info["fs"] or DEFAULT_FS
+    n_channels = len(channels) if channels is not None else len(info["channels"])
+    if protocol == "udp" and frame_samples * n_channels > MAX_UDP_VALUES:
+        raise ValueError(f"{frame_samples} samples x {n_channels} channels do not fit in one UDP datagram")
+    sock = _connect(host, port, protocol)
+    seq = sent = 0
+    start = time.monotonic()
+    try:
+        while True:
+            for chunk in iter_recording_chunks(path, int(fs * READ_SECONDS), channels):
+                for first in range(0, chunk.shape[1], frame_samples):
+                    frame = chunk[:, first:first + frame_samples] * scale
+                    if speed > 0:
+                        # Send each frame when its last sample is due
+                        delay = start + (sent + frame.shape[1]) / fs / speed - time.monotonic()
+                        if delay > 0:
+                            time.sleep(delay)
+                    data = encode_frame(seq, frame, fs)
+                    while True:
+                        try:
+                            sock.sendall(data)
+                            break
+                        except OSError:
+                            if protocol == "udp":
+                                # Nobody listening right now; the frame is simply lost
+                                break
+                            # Receiver went away: reconnect and resend from this frame on
+                            sock.close()
+                            sock = _connect(host, port, protocol)
+                            start = time.monotonic() - sent / fs / max(speed, 1e-9)
+                    seq += 1
+                    sent += frame.shape[1]
+            if not loop:
+                return seq
+    finally:
+        sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recording as a live EEG socket stream.")
+    parser.add_argument("path", help="Recording (.npy, .f32/.raw, .edf/.bdf or .csv)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--protocol", default="tcp", choices=PROTOCOLS)
+    parser.add_argument("--fs", type=float, default=None, help=f"Sampling rate (default: from the file, else {DEFAULT_FS})")
+    parser.add_argument("--frame-samples", type=int, default=DEFAULT_FRAME_SAMPLES, help="Samples per frame")
+    parser.add_argument("--channels", nargs="+", default=None, help="Channel indices (or EDF labels) to send")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed; 0 sends as fast as possible")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply samples by this (e.g. to fit the chart)")
+    parser.add_argument("--loop", action="store_true", help="Start over at the end of the recording")
+    args = parser.parse_args()
+
+    channels = args.channels
+    if channels is not None and all(c.isdigit() for c in channels):
+        channels = [int(c) for c in channels]
+    print(f"Replaying {args.path} to {args.protocol}://{args.host}:{args.port} (Ctrl+C to stop)")
+    start = time.monotonic()
+    try:
+        frames = replay_recording(args.path, args.host, args.port, args.protocol, args.fs, args.frame_samples,
+                                  channels, args.speed, args.loop, args.scale)
+    except KeyboardInterrupt:
+        return
+    print(f"Sent {frames:,} frames in {time.monotonic() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
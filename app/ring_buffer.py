@@ -0,0 +1,95 @@
+# Fixed-capacity circular buffer for multi-channel sample streams
+#
+#   buf = RingBuffer(capacity=512, n_channels=2)
+#   buf.append([0.1, -0.3])            # one sample per channel, O(1)
+#   buf.extend(block)                  # (channels, m) block in one copy
+#   buf.view()                         # (channels, len(buf)) oldest -> newest, no copy
+#
+# Every sample is stored twice, at i and i + capacity, in a (channels,
+# 2 * capacity) array. The newest `capacity` samples are then always one
+# contiguous slice in time order, so reading the window never needs np.roll
+# or a concatenate, and appending costs the same whatever the capacity.
+import numpy as np
+
+
+class RingBuffer:
+    """The last `capacity` samples of `n_channels` channels."""
+
+    def __init__(self, capacity, n_channels=1, dtype=np.float64):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.n_channels = n_channels
+        self._data = np.zeros((n_channels, 2 * capacity), dtype=dtype)
+        self.clear()
+
+    def clear(self):
+        self._head = 0  # index of the next write in [0, capacity)
+        self._size = 0
+        self.total = 0  # samples appended since the last clear
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    def append(self, sample):
+        """Add one sample (a scalar or one value per channel)."""
+        self._data[:, self._head] = sample
+        self._data[:, self._head + self.capacity] = sample
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        self.total += 1
+
+    def extend(self, samples):
+        """Add a (channels, m) block, or (m,) for one channel; only the last `capacity` are kept."""
+        samples = np.asarray(samples, dtype=self.dtype).reshape(self.n_channels, -1)
+        m = samples.shape[1]
+        self.total += m
+        if m > self.capacity:
+            samples = samples[:, -self.capacity:]
+        n = samples.shape[1]
+        first = min(n, self.capacity - self._head)
+        for offset in (0, self.capacity):
+            self._data[:, offset + self._head:offset + self._head + first] = samples[:, :first]
+            self._data[:, offset:offset + n - first] = samples[:, first:]
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def view(self, n=None):
+        """Read-only (channels, n) view of the newest n samples (default: all), oldest first."""
+        n = self._size if n is None else min(n, self._size)
+        end = self._head + self.capacity
+        out = self._data[:, end - n:end]
+        out.flags.writeable = False
+        return out
+
+    def latest(self):
+        """(channels,) newest sample."""
+        return self._data[:, self._head + self.capacity - 1].copy()
+
+
+def main():
+    import time
+
+    for capacity in (512, 65_536, 1 << 22):
+        buf = RingBuffer(capacity, n_channels=2)
+        buf.extend(np.zeros((2, capacity)))
+        sample = np.array([0.5, -0.5])
+        start = time.perf_counter()
+        for _ in range(10_000):
+            buf.append(sample)
+            buf.view()
+        per_tick_us = (time.perf_counter() - start) / 10_000 * 1e6
+        rolled = np.zeros((2, capacity))
+        start = time.perf_counter()
+        for _ in range(100):
+            rolled = np.roll(rolled, -1, axis=1)
+        roll_us = (time.perf_counter() - start) / 100 * 1e6
+        print(f"capacity {capacity:>9,}: append + view {per_tick_us:.1f} µs, np.roll {roll_us:,.0f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+# Socket ingestion of framed float32 EEG chunks into a LiveStream
+#
+#   receiver = StreamReceiver(stream, port=16571, protocol="tcp")   # or "udp"
+#   receiver.start()
+#   ...
+#   receiver.stats()    # {"rate": 255.8, "frames": 1200, "dropped": 0, "lost": 0, ...}
+#
+#   frame = encode_frame(seq, chunk, fs=256)                        # sender side
+#
+# A frame is a fixed little-endian header followed by the samples of one
+# chunk, interleaved sample by sample like an LSL push_chunk:
+#
+#   magic b"EEGF" | seq uint32 | channels uint16 | samples uint16 | fs float32 | timestamp float64
+#   float32[samples][channels]
+#
+# Over TCP frames follow each other on the connection (one sender at a time);
+# over UDP every datagram is one frame. Payloads are received straight into a
+# fresh buffer and decoded with np.frombuffer, so the only copy of the samples
+# is the one into the stream's ring buffer.
+#
+# The network thread only receives and decodes; a second thread writes the
+# pending frames into the stream in batches. When more than `max_pending`
+# frames are waiting, policy "drop-oldest" discards the oldest one (counted in
+# "dropped") and "block" stops reading until the writer catches up, which
+# over TCP pushes back on the sender. Gaps in the sequence numbers are
+# counted as "lost" (e.g. UDP datagrams that never arrived). Frames with no
+# samples or a payload over MAX_FRAME_BYTES are counted as "rejected"; over
+# TCP the connection is then closed, since its framing can't be trusted.
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+MAGIC = b"EEGF"
+FRAME_HEADER = struct.Struct("<4sIHHfd")
+DEFAULT_PORT = 16571
+PROTOCOLS = ["tcp", "udp"]
+POLICIES = ["drop-oldest", "block"]
+DEFAULT_MAX_PENDING = 64
+# Largest payload that fits one UDP datagram
+MAX_DATAGRAM = 65507
+MAX_UDP_VALUES = (MAX_DATAGRAM - FRAME_HEADER.size) // 4
+# Largest payload accepted over TCP (a header can announce up to 65535 x 65535 samples, ~17 GB)
+MAX_FRAME_BYTES = 4 * 1024 * 1024
+RATE_SECONDS = 2.0
+POLL_SECONDS = 0.2
+
+
+def encode_frame(seq, chunk, fs, timestamp=None):
+    """Header + interleaved float32 payload for a (channels, m) chunk."""
+    chunk = np.asarray(chunk)
+    if chunk.ndim == 1:
+        chunk = chunk[None, :]
+    n_channels, n_samples = chunk.shape
+    header = FRAME_HEADER.pack(MAGIC, seq & 0xFFFFFFFF, n_channels, n_samples, fs,
+                               time.time() if timestamp is None else timestamp)
+    return header + np.ascontiguousarray(chunk.T, dtype="<f4").tobytes()
+
+
+def decode_header(buffer):
+    """(seq, channels, samples, fs, timestamp) from the first FRAME_HEADER.size bytes."""
+    if len(buffer) < FRAME_HEADER.size:
+        raise ValueError(f"Frame of {len(buffer)} bytes is shorter than its header")
+    magic, seq, n_channels, n_samples, fs, timestamp = FRAME_HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"Bad frame magic {magic!r}")
+    if n_channels == 0:
+        raise ValueError("Frame has no channels")
+    if n_samples == 0:
+        raise ValueError("Frame has no samples")
+    if 4 * n_channels * n_samples > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {n_channels} x {n_samples} samples is over {MAX_FRAME_BYTES} bytes")
+    return seq, n_channels, n_samples, fs, timestamp
+
+
+def frame_samples(buffer, n_channels, n_samples, offset=0):
+    """(channels, samples) float32 view of an interleaved payload, without copying."""
+    count = n_channels * n_samples
+    if len(buffer) - offset < 4 * count:
+        raise ValueError(f"Frame payload is {len(buffer) - offset} bytes, expected {4 * count}")
+    return np.frombuffer(buffer, dtype="<f4", count=count, offset=offset).reshape(n_samples, n_channels).T
+
+
+def decode_frame(buffer):
+    """(header, samples) for one whole frame; samples is a view into buffer."""
+    header = decode_header(buffer)
+    return header, frame_samples(buffer, header[1], header[2], FRAME_HEADER.size)
+
+
+def _recv_exact(conn, view, should_stop):
+    """Fill view from conn (which has a timeout); False if the peer closed first or should_stop() turned true."""
+    while len(view):
+        try:
+            n = conn.recv_into(view)
+        except socket.timeout:
+            # Keep what was read so far, so a slow peer does not lose the frame boundary
+            if should_stop():
+                return False
+            continue
+        if n == 0:
+            return False
+        view = view[n:]
+    return True
+
+
+class StreamReceiver:
+    """Listens on a local port and writes the frames it receives into a LiveStream.
+
+    Has the same start() / stop() / touch() / running interface as
+    live_stream.SampleProducer, so the page can use either as its source.
+    The first stream.n_channels channels of every frame are kept (or the
+    given `channels` indices, one per stream channel); frames too narrow
+    for them are rejected.
+    """
+
+    def __init__(self, stream, host="127.0.0.1", port=DEFAULT_PORT, protocol="tcp", policy="drop-oldest",
+                 max_pending=DEFAULT_MAX_PENDING, channels=None, idle_timeout=None):
+        if protocol not in PROTOCOLS:
+            raise ValueError(f"Unknown protocol '{protocol}'. Choose from: {', '.join(PROTOCOLS)}")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}'. Choose from: {', '.join(POLICIES)}")
+        self.stream = stream
+        self.host = host
+        self.port = port
+        self.protocol = protocol
+        self.policy = policy
+        self.max_pending = max_pending
+        if channels is None:
+            self.channels = slice(0, stream.n_channels)
+            self._min_channels = stream.n_channels
+        else:
+            self.channels = [int(c) for c in channels]
+            if len(self.channels) != stream.n_channels or min(self.channels) < 0:
+                raise ValueError(f"channels must be {stream.n_channels} non-negative frame channel indices")
+            self._min_channels = max(self.channels) + 1
+        self.idle_timeout = idle_timeout
+        self.error = None
+        self._socket = None
+        self._threads = []
+        self._stop = threading.Event()
+        self._pending = deque()
+        self._ready = threading.Condition()
+        self._last_touch = time.monotonic()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._ready:
+            self.frames = 0
+            self.samples = 0
+            self.bytes = 0
+            self.dropped = 0
+            self.lost = 0
+            self.rejected = 0
+            self.sender_fs = None
+            self.connected = False
+            self._last_seq = None
+            self._arrivals = deque()
+
+    @property
+    def running(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    @property
+    def address(self):
+        """(host, port) actually bound; port 0 picks a free one on start()."""
+        return self._socket.getsockname()[:2] if self._socket is not None else (self.host, self.port)
+
+    def start(self):
+        if self.running:
+            return self
+        self.stop()
+        self._stop.clear()
+        self.error = None
+        self.touch()
+        kind = socket.SOCK_STREAM if self.protocol == "tcp" else socket.SOCK_DGRAM
+        self._socket = socket.socket(socket.AF_INET, kind)
+        if self.protocol == "tcp":
+            # Rebind right after a restart even while old connections sit in TIME_WAIT
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        else:
+            # Room for bursts while the receive thread is busy
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._socket.settimeout(POLL_SECONDS)
+        try:
+            self._socket.bind((self.host, self.port))
+            if self.protocol == "tcp":
+                self._socket.listen(1)
+        except OSError:
+            self._socket.close()
+            self._socket = None
+            raise
+        self._threads = [threading.Thread(target=self._receive, name="stream-receiver", daemon=True),
+                         threading.Thread(target=self._write_pending, name="stream-writer", daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        with self._ready:
+            self._ready.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        with self._ready:
+            self._pending.clear()
+            self.connected = False
+
+    def touch(self):
+        """Tell the receiver someone is still watching."""
+        self._last_touch = time.monotonic()
+
+    def _idle(self):
+        return self.idle_timeout is not None and time.monotonic() - self._last_touch > self.idle_timeout
+
+    def stats(self):
+        """Counters plus the sample rate received over the last RATE_SECONDS."""
+        with self._ready:
+            self._trim_arrivals(time.monotonic())
+            return {
+                "rate": sum(m for _, m in self._arrivals) / RATE_SECONDS,
+                "frames": self.frames, "samples": self.samples, "bytes": self.bytes,
+                "dropped": self.dropped, "lost": self.lost, "rejected": self.rejected,
+                "pending": len(self._pending), "sender_fs": self.sender_fs, "connected": self.connected,
+            }
+
+    def _trim_arrivals(self, now):
+        while self._arrivals and self._arrivals[0][0] < now - RATE_SECONDS:
+            self._arrivals.popleft()
+
+    # ================= RECEIVING =================
+    def _receive(self):
+        try:
+            self._serve_tcp() if self.protocol == "tcp" else self._serve_udp()
+        except Exception as e:
+            # Surface the failure through .error instead of a silently dead thread
+            self.error = e
+        finally:
+            # Idle or failed: let the writer finish too, so start() can begin afresh
+            self._stop.set()
+            with self._ready:
+                self._ready.notify_all()
+
+    def _serve_tcp(self):
+        while not self._stop.is_set() and not self._idle():
+            try:
+                conn, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+            except OSError as e:
+                self.error = e
+                break
+            with self._ready:
+                self.connected = True
+                # A new connection starts a new sequence
+                self._last_seq = None
+            with conn:
+                self._read_connection(conn)
+            with self._ready:
+                self.connected = False
+
+    def _read_connection(self, conn):
+        conn.settimeout(POLL_SECONDS)
+        header = bytearray(FRAME_HEADER.size)
+        should_stop = lambda: self._stop.is_set() or self._idle()
+        while not should_stop():
+            try:
+                if not _recv_exact(conn, memoryview(header), should_stop):
+                    return
+                seq, n_channels, n_samples, fs, _ = decode_header(header)
+                payload = bytearray(4 * n_channels * n_samples)
+                if not _recv_exact(conn, memoryview(payload), should_stop):
+                    return
+            except ValueError:
+                # Bad magic, an empty or oversized frame: the rest of the stream
+                # can't be trusted, so the sender has to reconnect
+                with self._ready:
+                    self.rejected += 1
+                return
+            except OSError:
+                return
+            self._accept(seq, fs, frame_samples(payload, n_channels, n_samples), len(header) + len(payload))
+
+    def _serve_udp(self):
+        while not self._stop.is_set() and not self._idle():
+            datagram = bytearray(MAX_DATAGRAM)
+            try:
+                n = self._socket.recv_into(datagram)
+            except socket.timeout:
+                continue
+            except OSError as e:
+                self.error = e
+                break
+            try:
+                (seq, _, _, fs, _), samples = decode_frame(memoryview(datagram)[:n])
+            except ValueError:
+                with self._ready:
+                    self.rejected += 1
+                continue
+            self._accept(seq, fs, samples, n)
+
+    def _accept(self, seq, fs, samples, n_bytes):
+        """Queue one decoded frame, applying the sequence check and the pending-frame policy."""
+        with self._ready:
+            if samples.shape[0] < self._min_channels:
+                self.rejected += 1
+                return
+            if self._last_seq is not None:
+                gap = (seq - self._last_seq - 1) & 0xFFFFFFFF
+                # A huge gap is a restarted sender, not two billion lost frames
+                if gap < 1 << 31:
+                    self.lost += gap
+            self._last_seq = seq
+            self.sender_fs = fs
+            while len(self._pending) >= self.max_pending and not self._stop.is_set():
+                if self.policy == "drop-oldest":
+                    self._pending.popleft()
+                    self.dropped += 1
+                else:
+                    self._ready.wait(POLL_SECONDS)
+            self._pending.append(samples[self.channels])
+            self.frames += 1
+            self.bytes += n_bytes
+            now = time.monotonic()
+            self._arrivals.append((now, samples.shape[1]))
+            self._trim_arrivals(now)
+            self._ready.notify_all()
+
+    def _write_pending(self):
+        while not self._stop.is_set():
+            with self._ready:
+                while not self._pending and not self._stop.is_set():
+                    self._ready.wait(POLL_SECONDS)
+                batch = list(self._pending)
+                self._pending.clear()
+                self._ready.notify_all()
+            if batch:
+                # One write (and one filter-bank call) for everything that piled up
+                block = batch[0] if len(batch) == 1 else np.concatenate(batch, axis=1)
+                try:
+                    self.stream.write(block)
+                except Exception as e:
+                    self.error = e
+                    self._stop.set()
+                    return
+                with self._ready:
+                    self.samples += block.shape[1]
+
+
+def main():
+    from live_stream import LiveStream
+
+    fs, n_channels, chunk = 256, 8, 32
+    signal = np.random.default_rng(0).normal(0, 20, (n_channels, fs * 60)).astype(np.float32)
+    for protocol in PROTOCOLS:
+        stream = LiveStream(fs, n_channels=n_channels, capacity=fs * 10)
+        receiver = StreamReceiver(stream, port=0, protocol=protocol, max_pending=4096).start()
+        kind = socket.SOCK_STREAM if protocol == "tcp" else socket.SOCK_DGRAM
+        with socket.socket(socket.AF_INET, kind) as sender:
+            sender.connect(receiver.address)
+            start = time.perf_counter()
+            for seq, first in enumerate(range(0, signal.shape[1], chunk)):
+                sender.sendall(encode_frame(seq, signal[:, first:first + chunk], fs))
+                if protocol == "udp" and seq % 64 == 0:
+                    # Let the receiver drain the socket buffer
+                    time.sleep(0.001)
+            while stream.total + (receiver.lost + receiver.dropped) * chunk < signal.shape[1] \
+                    and time.perf_counter() - start < 10:
+                time.sleep(0.001)
+            elapsed = time.perf_counter() - start
+        stats = receiver.stats()
+        receiver.stop()
+        print(f"{protocol}: {stream.total / fs:.0f} s of {n_channels}-channel signal in {elapsed * 1000:.0f} ms "
+              f"({stream.total / elapsed / 1000:,.0f}k samples/s), lost {stats['lost']}, dropped {stats['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# Streaming band power with a sliding DFT over the bins of each band
+#
+#   tracker = SlidingBandPower(fs=256, window=256)
+#   tracker.update(new_samples)          # one sample or a block, any length
+#   tracker.ratio("alpha", "beta")
+#
+# Only the DFT bins inside the bands are tracked. When a sample enters the
+# window and the oldest one leaves, each bin is updated in O(1):
+#
+#   X_k <- (X_k - x_oldest + x_new) * exp(2j * pi * k / N)
+#
+# so a new sample costs one add and one multiply per tracked bin, with a
+# single twiddle exp(2j * pi * k / N) stored per bin. The total power is a
+# running sum of squares. A block longer than MAX_RECURRENCE_BLOCK samples is
+# cheaper to absorb with one rfft over the new window, so it is written to the
+# buffer and the bins are recomputed instead. The same exact recomputation
+# runs every `window` samples (amortized O(log N) per sample), so rounding
+# errors cannot drift.
+#
+# Memory is O(bins) and the work per bin and sample does not depend on the
+# window length. The number of bins inside the bands does grow with it, since
+# a longer window has a finer frequency resolution.
+#
+# Band powers use the same bins, weights and units as band_power.band_powers()
+# on the last `window` samples (samples before the first one count as zero).
+import numpy as np
+
+from band_power import BANDS, band_plan
+from ring_buffer import RingBuffer
+
+# Longer blocks are absorbed with one rfft of the window instead of per-sample updates
+MAX_RECURRENCE_BLOCK = 16
+
+
+class SlidingBandPower:
+    """Band powers of the last `window` samples of one or more channels, updated per sample."""
+
+    def __init__(self, fs, window, bands=BANDS, n_channels=1):
+        self.fs = fs
+        self.window = window
+        self.bands = bands
+        self.n_channels = n_channels
+        _, weights, band_matrix = band_plan(window, fs, tuple(bands.values()))
+        self._bins = np.flatnonzero(band_matrix.any(axis=1))
+        self._band_matrix = band_matrix[self._bins]
+        self._twiddle = np.exp(2j * np.pi * self._bins / window)
+        self._buffer = RingBuffer(window, n_channels)
+        self._X = np.zeros((n_channels, len(self._bins)), dtype=complex)
+        self._sum_sq = np.zeros(n_channels)
+        self.reset()
+
+    def reset(self):
+        self._buffer.clear()
+        self._buffer.extend(np.zeros((self.n_channels, self.window)))
+        self._X[:] = 0.0
+        self._sum_sq[:] = 0.0
+        self._since_resync = 0
+        self.samples_seen = 0
+
+    def update(self, samples):
+        """Push samples: a scalar, (m,) for one channel or (channels, m)."""
+        samples = np.asarray(samples, dtype=np.float64)
+        if samples.ndim < 2:
+            samples = samples.reshape(self.n_channels, -1)
+        m = samples.shape[1]
+        self.samples_seen += m
+        if m > MAX_RECURRENCE_BLOCK:
+            self._buffer.extend(samples)
+            self.resync()
+            return self
+        # The m oldest samples leave the window as the block enters it
+        delta = samples - self._buffer.view(self.window)[:, :m]
+        self._sum_sq += (delta * (samples + self._buffer.view(self.window)[:, :m])).sum(axis=1)
+        for j in range(m):
+            self._X += delta[:, j:j + 1]
+            self._X *= self._twiddle
+        self._buffer.extend(samples)
+        self._since_resync += m
+        if self._since_resync >= self.window:
+            self.resync()
+        return self
+
+    push = update
+
+    def resync(self):
+        """Recompute the tracked bins and the sum of squares exactly from the buffered window."""
+        ordered = self._buffer.view()
+        self._X = np.fft.rfft(ordered, axis=-1)[:, self._bins]
+        self._sum_sq = (ordered ** 2).sum(axis=1)
+        self._since_resync = 0
+
+    def band_powers(self):
+        """(channels, bands) power of the current window."""
+        power = self._X.real ** 2 + self._X.imag ** 2
+        return power @ self._band_matrix
+
+    def total_power(self):
+        """(channels,) mean square of the current window."""
+        return np.maximum(self._sum_sq, 0.0) / self.window
+
+    def relative_band_powers(self):
+        total = self.total_power()[:, None]
+        powers = self.band_powers()
+        return np.divide(powers, total, out=np.zeros_like(powers), where=total > 0)
+
+    def ratio(self, numerator, denominator):
+        """(channels,) ratio of two bands' power, e.g. ratio("alpha", "beta")."""
+        names = list(self.bands)
+        powers = self.band_powers()
+        num, den = powers[:, names.index(numerator)], powers[:, names.index(denominator)]
+        return np.divide(num, den, out=np.zeros_like(num), where=den > 0)
+
+
+def main():
+    import time
+    from band_power import band_powers
+
+    fs = 256
+    rng = np.random.default_rng(0)
+    x = np.sin(2 * np.pi * 10 * np.arange(fs * 60) / fs) + rng.normal(0, 0.5, fs * 60)
+    for window in (256, 1024, 4096, 8192):
+        tracker = SlidingBandPower(fs, window)
+        tracker.update(x[:-1000])
+        start = time.perf_counter()
+        for sample in x[-1000:]:
+            tracker.push(sample)
+        per_sample_us = (time.perf_counter() - start) / 1000 * 1e6
+        diff = np.abs(tracker.band_powers()[0] - band_powers(x[-window:], fs)).max()
+        print(f"window {window}: {per_sample_us:.1f} µs per sample, {len(tracker._bins)} bins, max |diff| vs FFT {diff:.2g}")
+
+
+if __name__ == "__main__":
+    main()
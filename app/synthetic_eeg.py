@@ -0,0 +1,99 @@
+# Synthetic EEG waveforms from the dataset's relative band powers
+#
+#   t, waves = synthesize_waves(df, fs=256, duration=2, seed=0)   # (N, samples)
+#   t, wave = synthesize_waves(row)                              # one row -> (samples,)
+#
+# Each band contributes one sine at a representative frequency, weighted by
+# the row's {band}_rel value, plus a little Gaussian noise; every waveform is
+# then scaled to a peak of 1. The (bands x samples) sine basis is built once
+# per (fs, duration) and cached, so N rows are a single (N, 5) @ (5, samples)
+# matrix product. With a seed the output is reproducible, so the waveforms of
+# a whole dataset can be rendered once and cached.
+#
+#   source = SyntheticSource(df.iloc[:2], fs=256)
+#   block = source(64)        # the next 64 samples of both rows, continuing in time
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from band_power import BANDS
+
+# Representative frequency (Hz) of every band's sine
+BAND_FREQUENCIES = OrderedDict([("delta", 2), ("theta", 6), ("alpha", 10), ("beta", 20), ("gamma", 40)])
+REL_COLUMNS = [f"{band}_rel" for band in BANDS]
+DEFAULT_FS = 256
+DEFAULT_DURATION = 2.0
+DEFAULT_NOISE = 0.05
+
+
+@lru_cache(maxsize=32)
+def sine_basis(fs=DEFAULT_FS, duration=DEFAULT_DURATION):
+    """(t, basis) for duration seconds at fs Hz; basis is (bands, samples). Arrays are read-only."""
+    t = np.arange(int(round(duration * fs))) / fs
+    basis = np.sin(2 * np.pi * np.array(list(BAND_FREQUENCIES.values()))[:, None] * t)
+    for array in (t, basis):
+        array.setflags(write=False)
+    return t, basis
+
+
+def synthesize_waves(rel, fs=DEFAULT_FS, duration=DEFAULT_DURATION, noise=DEFAULT_NOISE, seed=None,
+                     dtype=np.float64):
+    """(t, waves) for relative band powers rel.
+
+    rel is a DataFrame or Series with the {band}_rel columns, an (N, 5) array
+    or one row of 5 values; waves is (N, samples), or (samples,) for one row.
+    """
+    if hasattr(rel, "loc"):
+        rel = rel[REL_COLUMNS]
+    rel = np.asarray(rel, dtype=np.float64)
+    t, basis = sine_basis(fs, duration)
+    waves = np.atleast_2d(rel) @ basis
+    if noise:
+        waves += noise * np.random.default_rng(seed).standard_normal(waves.shape)
+    waves /= np.abs(waves).max(axis=-1, keepdims=True) + 1e-9
+    waves = waves.astype(dtype, copy=False)
+    return t, waves[0] if rel.ndim == 1 else waves
+
+
+class SyntheticSource:
+    """Endless version of synthesize_waves() for streaming; each call continues where the last stopped.
+
+    Rows are scaled by the peak of their noiseless waveform, so the amplitude
+    matches synthesize_waves(). noise may be one value or one per row.
+    """
+
+    def __init__(self, rel, fs=DEFAULT_FS, noise=DEFAULT_NOISE, seed=None):
+        if hasattr(rel, "loc"):
+            rel = rel[REL_COLUMNS]
+        self.rel = np.atleast_2d(np.asarray(rel, dtype=np.float64))
+        self.fs = fs
+        self.noise = np.broadcast_to(np.asarray(noise, dtype=np.float64).reshape(-1, 1), (len(self.rel), 1))
+        self.position = 0
+        self._rng = np.random.default_rng(seed)
+        self._freqs = np.array(list(BAND_FREQUENCIES.values()), dtype=np.float64)[:, None]
+        _, basis = sine_basis(fs, DEFAULT_DURATION)
+        self._scale = 1.0 / (np.abs(self.rel @ basis).max(axis=-1, keepdims=True) + 1e-9)
+
+    def __call__(self, n):
+        """(rows, n) next samples."""
+        t = (self.position + np.arange(n)) / self.fs
+        self.position += n
+        waves = self.rel @ np.sin(2 * np.pi * self._freqs * t) + self.noise * self._rng.standard_normal((len(self.rel), n))
+        return waves * self._scale
+
+
+def main():
+    import time
+    import pandas as pd
+    from eeg_inference import DATA_PATH
+
+    df = pd.read_csv(DATA_PATH)
+    start = time.perf_counter()
+    _, waves = synthesize_waves(df, seed=0, dtype=np.float32)
+    elapsed = time.perf_counter() - start
+    print(f"{len(df):,} waveforms of {waves.shape[1]} samples in {elapsed * 1000:.0f} ms ({waves.nbytes / 1e6:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# App modules import each other as top-level modules, like the pages do
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
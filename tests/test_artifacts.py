@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from artifacts import DEFAULT_THRESHOLDS, artifact_flags
+from eeg_windows import window_features
+
+FS = 256
+
+
+def eeg_like(seconds, seed=0):
+    """1/f background plus a 10 Hz alpha rhythm, in µV."""
+    rng = np.random.default_rng(seed)
+    n = FS * seconds
+    freqs = np.fft.rfftfreq(n, 1 / FS)
+    spectrum = (rng.normal(size=len(freqs)) + 1j * rng.normal(size=len(freqs))) / np.maximum(freqs, 0.5)
+    background = np.fft.irfft(spectrum, n)
+    return 20 * background / background.std() + 15 * np.sin(2 * np.pi * 10 * np.arange(n) / FS)
+
+
+def test_clean_eeg_passes():
+    flags = artifact_flags(eeg_like(60), FS, FS, FS // 2)
+    assert not flags["rejected"].any()
+
+
+@pytest.mark.parametrize("fs", [128, 256, 512, 1000])
+def test_broadband_noise_passes_hf_check(fs):
+    noise = np.random.default_rng(1).normal(0, 10, fs * 60)
+    assert not artifact_flags(noise, fs, fs)["hf_ratio"].any()
+
+
+def test_muscle_burst_is_flagged():
+    x = eeg_like(20)
+    x[FS * 10:FS * 11] += 40 * np.diff(np.random.default_rng(2).normal(0, 1, FS + 1))
+    flags = artifact_flags(x, FS, FS)
+    assert np.flatnonzero(flags["hf_ratio"]).tolist() == [10]
+
+
+def test_window_features_share_the_hf_ratio():
+    x = eeg_like(20)
+    x[FS * 5:FS * 6] += 40 * np.diff(np.random.default_rng(3).normal(0, 1, FS + 1))
+    feats = window_features(x, FS, FS, FS // 2, artifacts={})
+    for name, flag in artifact_flags(x, FS, FS, FS // 2, DEFAULT_THRESHOLDS).items():
+        assert np.array_equal(feats["artifacts"][name], flag)
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from compiled_predictor import compile_pipeline
+from model_artifacts import load_artifact, save_artifact
+
+MODELS = {
+    "logistic": lambda: LogisticRegression(max_iter=2000),
+    "mlp": lambda: MLPClassifier(hidden_layer_sizes=(16, 8), max_iter=300, random_state=0),
+    "forest": lambda: RandomForestClassifier(n_estimators=10, max_depth=6, random_state=0),
+    "tree": lambda: DecisionTreeClassifier(max_depth=6, random_state=0),
+}
+SCALERS = {
+    "none": lambda: None,
+    "standard": StandardScaler,
+    "standard-no-mean": lambda: StandardScaler(with_mean=False),
+    "standard-no-std": lambda: StandardScaler(with_std=False),
+    "minmax": MinMaxScaler,
+}
+
+
+def make_data(n_classes, seed=0):
+    rng = np.random.default_rng(seed)
+    # Offset, unevenly scaled features so the scaler actually matters
+    X = rng.normal(size=(300, 6)) * [1, 10, 100, 0.1, 5, 50] + [3, -20, 500, 0, 7, 100]
+    y = (X[:, 0] + X[:, 1] / 10 + rng.normal(size=300) > 0).astype(int)
+    if n_classes > 2:
+        y += (X[:, 2] > 500).astype(int)
+    return X, y
+
+
+def fit(model_name, scaler_name, X, y):
+    scaler = SCALERS[scaler_name]()
+    model = MODELS[model_name]()
+    model.fit(scaler.fit_transform(X) if scaler is not None else X, y)
+    return model, scaler
+
+
+def sklearn_proba(model, scaler, X):
+    return model.predict_proba(scaler.transform(X) if scaler is not None else X)
+
+
+@pytest.mark.filterwarnings("ignore::sklearn.exceptions.ConvergenceWarning")
+@pytest.mark.parametrize("n_classes", [2, 3])
+@pytest.mark.parametrize("scaler_name", list(SCALERS))
+@pytest.mark.parametrize("model_name", list(MODELS))
+def test_matches_sklearn(model_name, scaler_name, n_classes):
+    X, y = make_data(n_classes)
+    model, scaler = fit(model_name, scaler_name, X, y)
+    predictor = compile_pipeline(model, scaler)
+    X_test, _ = make_data(n_classes, seed=1)
+    assert np.allclose(predictor.predict_proba(X_test), sklearn_proba(model, scaler, X_test))
+    assert np.array_equal(predictor.predict(X_test), model.predict(scaler.transform(X_test) if scaler is not None else X_test))
+
+
+@pytest.mark.filterwarnings("ignore::sklearn.exceptions.ConvergenceWarning")
+def test_pipeline_input():
+    X, y = make_data(3)
+    pipeline = Pipeline([("scale", StandardScaler(with_mean=False)), ("model", MODELS["mlp"]())]).fit(X, y)
+    assert np.allclose(compile_pipeline(pipeline).predict_proba(X), pipeline.predict_proba(X))
+
+
+@pytest.mark.parametrize("model_name", ["logistic", "forest"])
+def test_artifact_round_trip(tmp_path, model_name):
+    X, y = make_data(2)
+    model, scaler = fit(model_name, "standard-no-mean", X, y)
+    save_artifact(compile_pipeline(model, scaler), str(tmp_path / "model.eegm"), {})
+    loaded = load_artifact(str(tmp_path / "model.eegm"))
+    assert np.allclose(loaded.predict_proba(X), sklearn_proba(model, scaler, X))
+
+
+def test_single_row():
+    X, y = make_data(2)
+    model, scaler = fit("logistic", "standard", X, y)
+    assert np.allclose(compile_pipeline(model, scaler).predict_proba(X[0]), sklearn_proba(model, scaler, X[:1]))
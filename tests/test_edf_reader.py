@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from edf_reader import EDFFile
+
+LABELS = ["Fp1", "Fp2", "C3"]
+SPR = 4
+
+
+def write_edf(path, records, reserved=""):
+    """Write digital int16 records of shape (n_records, channels, SPR) as a minimal EDF file."""
+    n_records, n_signals, _ = records.shape
+
+    def fields(values, width):
+        return "".join(str(v).ljust(width) for v in values)
+
+    header = (
+        "0".ljust(8) + "".ljust(80) + "".ljust(80) + "01.01.2501.00.00"
+        + str(256 * (n_signals + 1)).ljust(8) + reserved.ljust(44)
+        + str(n_records).ljust(8) + "1".ljust(8) + str(n_signals).ljust(4)
+        + fields(LABELS[:n_signals], 16) + fields([""] * n_signals, 80) + fields(["uV"] * n_signals, 8)
+        + fields([-100] * n_signals, 8) + fields([100] * n_signals, 8)
+        + fields([-32768] * n_signals, 8) + fields([32767] * n_signals, 8)
+        + fields([""] * n_signals, 80) + fields([SPR] * n_signals, 8) + fields([""] * n_signals, 32)
+    )
+    with open(path, "wb") as f:
+        f.write(header.encode("ascii"))
+        f.write(records.astype("<i2").tobytes())
+
+
+@pytest.fixture
+def recording(tmp_path):
+    records = np.arange(2 * len(LABELS) * SPR, dtype=np.int16).reshape(2, len(LABELS), SPR) * 100
+    path = str(tmp_path / "night.edf")
+    write_edf(path, records)
+    return path, records.transpose(1, 0, 2).reshape(len(LABELS), -1)
+
+
+def test_rows_by_slice_list_and_array(recording):
+    path, digital = recording
+    edf = EDFFile(path)
+    full = edf[:, :]
+    assert full.shape == digital.shape
+    assert np.array_equal(edf[[0, 2], 1:6], full[[0, 2], 1:6])
+    assert np.array_equal(edf[np.array([2, 1]), :], full[[2, 1]])
+    assert np.array_equal(edf[1], full[1:2])
+
+
+def test_discontinuous_edf_is_rejected(tmp_path):
+    path = str(tmp_path / "gaps.edf")
+    write_edf(path, np.zeros((2, len(LABELS), SPR), dtype=np.int16), reserved="EDF+D")
+    with pytest.raises(ValueError, match="EDF\\+D"):
+        EDFFile(path)
@@ -0,0 +1,34 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+from compiled_predictor import compile_pipeline
+from eeg_inference import score_batch
+from latency_stats import LatencyStore
+
+
+def fitted(model):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 4)) * [1, 10, 100, 0.1] + [3, -20, 500, 0]
+    scaler = StandardScaler().fit(X)
+    return model.fit(scaler.transform(X), X[:, 0] > 3), scaler, X
+
+
+def stages(store, model):
+    return {row["stage"]: row["calls"] for row in store.summary() if row["model"] == model}
+
+
+def test_every_stage_is_timed_once():
+    store = LatencyStore()
+    for model in (LogisticRegression(), RandomForestClassifier(n_estimators=5, random_state=0)):
+        model, scaler, X = fitted(model)
+        name = type(model).__name__
+        compiled = compile_pipeline(model, scaler)
+        labels, proba = score_batch(compiled, None, X, timer=store.stage_timer(name))
+        assert stages(store, name) == {"transform": 1, "predict_proba": 1, "predict": 1}
+        assert np.allclose(proba, model.predict_proba(scaler.transform(X)))
+        assert np.array_equal(labels, model.predict(scaler.transform(X)))
+        sk_labels, sk_proba = score_batch(model, scaler, X, timer=store.stage_timer(name + "-sklearn"))
+        assert stages(store, name + "-sklearn") == {"transform": 1, "predict_proba": 1, "predict": 1}
+        assert np.array_equal(sk_labels, labels)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from eeg_windows import WINDOW_FEATURES, iter_window_features, window_features
+
+FS = 128
+
+
+def signal(channels=3, seconds=60, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(FS * seconds) / FS
+    return np.sin(2 * np.pi * 10 * t) + rng.normal(0, 0.5, (channels, len(t)))
+
+
+def chunked(x, size):
+    for first in range(0, x.shape[-1], size):
+        yield x[:, first:first + size]
+
+
+def joined(parts):
+    starts = np.concatenate([starts for starts, _ in parts])
+    feats = {name: np.concatenate([f[name] for _, f in parts], axis=1) for name in WINDOW_FEATURES + ["rejected"]}
+    return starts, feats
+
+
+@pytest.mark.parametrize("window,step", [(128, 128), (128, 32), (100, 7), (64, 200)])
+@pytest.mark.parametrize("chunk", [1, 50, 129, 1000, 10_000])
+def test_chunks_match_one_pass(window, step, chunk):
+    x = signal(seconds=30)
+    whole = window_features(x, FS, window, step, artifacts={})
+    starts, feats = joined(list(iter_window_features(chunked(x, chunk), FS, window, step, artifacts={})))
+    assert np.array_equal(starts, np.arange(whole["mean"].shape[-1]) * step)
+    for name in WINDOW_FEATURES + ["rejected"]:
+        np.testing.assert_allclose(feats[name], whole[name], rtol=1e-9, atol=1e-12, err_msg=name)
+
+
+def test_uneven_chunks_and_one_dimensional_input():
+    x = signal(channels=1, seconds=20)[0]
+    sizes = np.random.default_rng(4).integers(1, 400, 200)
+    bounds = np.cumsum(sizes)
+    chunks = [x[a:b] for a, b in zip(np.r_[0, bounds], bounds) if a < len(x)]
+    whole = window_features(x[None], FS, FS, FS // 3, artifacts={})
+    starts, feats = joined(list(iter_window_features(iter(chunks), FS, FS, FS // 3, artifacts={})))
+    assert np.array_equal(starts, np.arange(whole["mean"].shape[-1]) * (FS // 3))
+    np.testing.assert_allclose(feats["variance"], whole["variance"])
+
+
+def test_short_signal_yields_nothing():
+    assert list(iter_window_features(chunked(signal(seconds=1), 10), FS, FS * 2)) == []
+
+
+def test_small_batches_match_one_pass():
+    x = signal()
+    window, step = FS * 4, 3
+    whole = window_features(x, FS, window, step, artifacts={})
+    # A budget of a few windows forces many batches per chunk
+    parts = list(iter_window_features(chunked(x, FS * 30), FS, window, step, artifacts={},
+                                      max_batch_bytes=32 * window * x.shape[0] * 5))
+    assert max(len(starts) for starts, _ in parts) == 5
+    starts, feats = joined(parts)
+    assert np.array_equal(starts, np.arange(whole["mean"].shape[-1]) * step)
+    for name in WINDOW_FEATURES + ["rejected"]:
+        assert np.allclose(feats[name], whole[name]), name
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+
+from forest_engine import MAX_BITVECTOR_LEAVES, STEPPING_MAX_ROWS, PackedForest
+
+
+def make_data(n_classes, rows=600, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, 8)) * [1, 10, 100, 0.1, 5, 50, 1, 1]
+    y = (X[:, 0] + X[:, 1] / 10 > 0).astype(int) + (n_classes > 2) * (X[:, 2] > 0)
+    return X, y
+
+
+@pytest.mark.parametrize("n_classes", [2, 3])
+@pytest.mark.parametrize("estimator", [RandomForestClassifier, ExtraTreesClassifier])
+def test_bitvector_path_matches_sklearn(monkeypatch, estimator, n_classes):
+    X, y = make_data(n_classes)
+    model = estimator(n_estimators=25, max_leaf_nodes=MAX_BITVECTOR_LEAVES, random_state=0).fit(X, y)
+    forest = PackedForest.from_estimator(model)
+    assert forest._groups is not None
+
+    calls = []
+    bitvector = forest._bitvector_proba
+    monkeypatch.setattr(forest, "_bitvector_proba", lambda X: calls.append(len(X)) or bitvector(X))
+    monkeypatch.setattr(forest, "apply", lambda X: pytest.fail("stepping evaluator used"))
+    X_test, _ = make_data(n_classes, rows=500, seed=1)
+    proba = forest.predict_proba(X_test)
+    assert calls == [500]
+    np.testing.assert_allclose(proba, model.predict_proba(X_test), rtol=0, atol=1e-12)
+    assert np.array_equal(model.classes_[proba.argmax(axis=1)], model.predict(X_test))
+
+
+def test_bitvector_and_stepping_agree():
+    X, y = make_data(3)
+    model = RandomForestClassifier(n_estimators=10, max_depth=4, random_state=0).fit(X, y)
+    forest = PackedForest.from_estimator(model)
+    X_test, _ = make_data(3, rows=300, seed=2)
+    stepped = forest._value[forest.apply(X_test)].sum(axis=1) / forest.n_trees
+    assert np.allclose(forest.predict_proba(X_test), stepped, rtol=0, atol=1e-12)
+    # Tiny batches take the stepping path, large ones are chunked over threads
+    assert np.allclose(forest.predict_proba(X_test[:STEPPING_MAX_ROWS]), stepped[:STEPPING_MAX_ROWS])
+    assert np.allclose(forest.predict_proba(X_test, n_threads=2, chunk_rows=64), stepped)
+
+
+def test_deep_trees_fall_back_to_stepping():
+    X, y = make_data(3)
+    model = RandomForestClassifier(n_estimators=3, random_state=0).fit(X, y)
+    assert max(tree.get_n_leaves() for tree in model.estimators_) > MAX_BITVECTOR_LEAVES
+    forest = PackedForest.from_estimator(model)
+    assert forest._groups is None
+    assert np.allclose(forest.predict_proba(X), model.predict_proba(X))
@@ -0,0 +1,53 @@
+import os
+import time
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+import model_artifacts
+from compiled_predictor import compile_pipeline
+from model_artifacts import HEADER_FILE, load_artifact, read_header, save_artifact
+
+
+def make_predictor(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(100, 4))
+    model = LogisticRegression().fit(X, X[:, 0] > 0)
+    return compile_pipeline(model), X
+
+
+def test_resave_publishes_new_data(tmp_path):
+    path = str(tmp_path / "model.eegm")
+    first, X = make_predictor(0)
+    second, _ = make_predictor(1)
+    save_artifact(first, path, {})
+    old = load_artifact(path)
+    save_artifact(second, path, {})
+    assert np.allclose(load_artifact(path).predict_proba(X), second.predict_proba(X))
+    # The superseded data directory is still there for readers that mapped it
+    assert np.allclose(old.predict_proba(X), first.predict_proba(X))
+
+
+def test_stale_data_is_removed(tmp_path, monkeypatch):
+    path = str(tmp_path / "model.eegm")
+    predictor, X = make_predictor(0)
+    save_artifact(predictor, path, {})
+    monkeypatch.setattr(model_artifacts, "STALE_SECONDS", -1)
+    save_artifact(predictor, path, {})
+    assert sorted(os.listdir(path)) == sorted([HEADER_FILE, read_header(path)["data"]])
+
+
+def test_load_rereads_header_after_removal(tmp_path, monkeypatch):
+    path = str(tmp_path / "model.eegm")
+    predictor, X = make_predictor(0)
+    save_artifact(predictor, path, {})
+    stale = read_header(path)
+    save_artifact(predictor, path, {})
+    fresh = read_header(path)
+    headers = iter([stale, fresh])
+    # The first header read points at a data directory that has since been deleted
+    monkeypatch.setattr(model_artifacts, "read_header", lambda p: next(headers))
+    monkeypatch.setattr(time, "sleep", lambda s: None)
+    for name in os.listdir(os.path.join(path, stale["data"])):
+        os.remove(os.path.join(path, stale["data"], name))
+    assert np.allclose(load_artifact(path).predict_proba(X), predictor.predict_proba(X))
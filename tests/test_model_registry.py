@@ -0,0 +1,18 @@
+import pytest
+
+from model_registry import MODEL_SPECS, ModelRegistry
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize("name", list(MODEL_SPECS))
+def test_spec_type_matches_the_model(name):
+    registry = ModelRegistry()
+    if not registry.available(name):
+        pytest.skip(f"{MODEL_SPECS[name].filename} is not in models/")
+    assert registry.get(name).info["model_type"] == MODEL_SPECS[name].model_type
+
+
+def test_specs_are_read_without_loading():
+    registry = ModelRegistry()
+    assert {name: registry.spec(name).model_type for name in registry.names()}
+    assert registry.resident_bytes() == 0
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from ring_buffer import RingBuffer
+
+
+def reference(samples, capacity):
+    return samples[:, -capacity:]
+
+
+@pytest.mark.parametrize("block", [1, 3, 7, 16, 40])
+def test_wraps_around_in_time_order(block):
+    capacity = 16
+    rng = np.random.default_rng(block)
+    stream = rng.normal(size=(2, 250))
+    buf = RingBuffer(capacity, n_channels=2)
+    for first in range(0, stream.shape[1], block):
+        buf.extend(stream[:, first:first + block])
+        written = stream[:, :first + block]
+        assert len(buf) == min(written.shape[1], capacity)
+        assert buf.total == written.shape[1]
+        assert np.array_equal(buf.view(), reference(written, capacity))
+        assert np.array_equal(buf.latest(), written[:, -1])
+
+
+def test_append_matches_extend_and_partial_views():
+    buf, other = RingBuffer(5, n_channels=2), RingBuffer(5, n_channels=2)
+    samples = np.arange(24, dtype=float).reshape(2, 12)
+    for j in range(samples.shape[1]):
+        buf.append(samples[:, j])
+    other.extend(samples)
+    assert np.array_equal(buf.view(), other.view())
+    assert np.array_equal(buf.view(3), samples[:, -3:])
+    # Asking for more than is stored returns what there is
+    assert np.array_equal(buf.view(50), samples[:, -5:])
+
+
+def test_view_is_read_only_and_clear_resets():
+    buf = RingBuffer(4)
+    buf.extend([1.0, 2.0, 3.0])
+    assert np.array_equal(buf.view(), [[1.0, 2.0, 3.0]])
+    with pytest.raises(ValueError):
+        buf.view()[0, 0] = 9.0
+    buf.clear()
+    assert len(buf) == 0 and buf.total == 0 and buf.view().shape == (1, 0)
+
+
+def test_rejects_empty_capacity():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
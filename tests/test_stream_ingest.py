@@ -0,0 +1,66 @@
+import socket
+import time
+
+import numpy as np
+import pytest
+
+from live_stream import LiveStream
+from stream_ingest import FRAME_HEADER, MAGIC, StreamReceiver, decode_header, encode_frame
+
+FS = 256
+
+
+def header(n_channels, n_samples, seq=0):
+    return FRAME_HEADER.pack(MAGIC, seq, n_channels, n_samples, FS, 0.0)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture(params=["tcp", "udp"])
+def receiver(request):
+    stream = LiveStream(FS, n_channels=2, capacity=FS * 4)
+    receiver = StreamReceiver(stream, port=0, protocol=request.param).start()
+    yield receiver
+    receiver.stop()
+
+
+def send(receiver, *frames):
+    kind = socket.SOCK_STREAM if receiver.protocol == "tcp" else socket.SOCK_DGRAM
+    with socket.socket(socket.AF_INET, kind) as sender:
+        sender.connect(receiver.address)
+        for frame in frames:
+            sender.sendall(frame)
+        if receiver.protocol == "tcp":
+            # Wait for the receiver to close a rejected connection (or to take the frames)
+            sender.settimeout(2.0)
+            try:
+                sender.recv(1)
+            except (socket.timeout, ConnectionResetError):
+                pass
+
+
+def test_decode_header_rejects_empty_and_oversized_frames():
+    assert decode_header(header(2, 32))[1:3] == (2, 32)
+    with pytest.raises(ValueError, match="no samples"):
+        decode_header(header(2, 0))
+    with pytest.raises(ValueError, match="bytes"):
+        decode_header(header(65535, 65535))
+
+
+@pytest.mark.parametrize("bad", [header(2, 0), header(65535, 65535)], ids=["empty", "oversized"])
+def test_bad_frame_is_rejected_and_ingestion_continues(receiver, bad):
+    chunk = np.ones((2, 32), dtype=np.float32)
+    if receiver.protocol == "tcp":
+        # The bad frame closes its connection; a new one is served as usual
+        send(receiver, encode_frame(0, chunk, FS), bad)
+        send(receiver, encode_frame(0, chunk, FS))
+    else:
+        send(receiver, encode_frame(0, chunk, FS), bad, encode_frame(1, chunk, FS))
+    assert wait_for(lambda: receiver.stream.total == 64)
+    assert receiver.stats()["rejected"] == 1
+    assert receiver.running and receiver.error is None
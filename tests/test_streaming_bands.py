@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from band_power import band_powers
+from streaming_bands import MAX_RECURRENCE_BLOCK, SlidingBandPower
+
+FS = 256
+
+
+def signal(n, channels=2, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / FS
+    return np.sin(2 * np.pi * 10 * t) + 0.5 * np.sin(2 * np.pi * 22 * t) + rng.normal(0, 0.5, (channels, n))
+
+
+def assert_matches_fft(tracker, seen):
+    window = seen[:, -tracker.window:]
+    if window.shape[1] < tracker.window:
+        # Samples before the first one count as zero
+        window = np.pad(window, ((0, 0), (tracker.window - window.shape[1], 0)))
+    np.testing.assert_allclose(tracker.band_powers(), band_powers(window, FS), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(tracker.total_power(), (window ** 2).mean(axis=1), rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("window", [64, 256, 1000])
+def test_matches_direct_fft_after_many_updates(window):
+    x = signal(FS * 40)
+    tracker = SlidingBandPower(FS, window, n_channels=2)
+    rng = np.random.default_rng(1)
+    pos = 0
+    # Mixed block sizes exercise both the per-sample recurrence and the rfft path
+    while pos < x.shape[1]:
+        m = int(rng.choice([1, 2, 5, MAX_RECURRENCE_BLOCK, MAX_RECURRENCE_BLOCK + 1, 300]))
+        tracker.update(x[:, pos:pos + m])
+        pos += m
+        assert_matches_fft(tracker, x[:, :pos])
+    assert tracker.samples_seen == x.shape[1]
+
+
+def test_single_samples_between_resyncs_do_not_drift():
+    window = 4096
+    x = signal(window * 2, channels=1)[0]
+    tracker = SlidingBandPower(FS, window)
+    tracker.update(x[:window])
+    # window - 1 one-sample updates: the longest stretch the recurrence runs without a resync
+    for sample in x[window:2 * window - 1]:
+        tracker.update(sample)
+    assert tracker._since_resync == window - 1
+    assert_matches_fft(tracker, x[None, :2 * window - 1])
+
+
+def test_ratio_and_relative_powers():
+    x = signal(FS * 4)
+    tracker = SlidingBandPower(FS, FS, n_channels=2).update(x)
+    powers = band_powers(x[:, -FS:], FS)
+    np.testing.assert_allclose(tracker.ratio("alpha", "beta"), powers[:, 2] / powers[:, 3])
+    np.testing.assert_allclose(tracker.relative_band_powers(),
+                               powers / (x[:, -FS:] ** 2).mean(axis=1, keepdims=True))